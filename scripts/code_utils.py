@@ -2,6 +2,7 @@
 # Utilities for detecting coding topics and extracting/sanitizing code references
 
 import re
+from functools import lru_cache
 from typing import List, Tuple
 
 # Coding-related keywords that indicate a topic should include code displays
@@ -32,9 +33,25 @@ CODE_MENTION_PATTERNS = [
     r'```', r'`[^`]+`'
 ]
 
+# Compiled once at import; the mention patterns are joined into a single
+# alternation so each sentence is scanned once instead of once per pattern.
+_CODE_MENTION_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in CODE_MENTION_PATTERNS), re.IGNORECASE
+)
+_SEE_CODE_RE = re.compile(
+    r"(see|look at|check out)\s+(below|the code|code below|here)", re.IGNORECASE
+)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_CODE_BLOCK_RE = re.compile(r'```[\s\S]*?```')
+_INLINE_CODE_RE = re.compile(r'`[^`]+`')
+_CODE_DISPLAY_RE = re.compile(r'\[CODE_DISPLAY:\s*([^\]]+)\]', re.IGNORECASE)
+_FENCED_SNIPPET_RE = re.compile(r'```(?:python|js|javascript|json)?\n([\s\S]*?)```')
+_CODE_TAG_RE = re.compile(r'\[CODE:\s*([^\]]+)\]')
 
+
+@lru_cache(maxsize=512)
 def is_coding_topic(topic: str) -> bool:
-    """Check if topic should include code displays."""
+    """Check if topic should include code displays (cached; topics repeat)."""
     if not topic:
         return False
     
@@ -52,7 +69,7 @@ def extract_code_markers(visual_cues: List) -> List[str]:
     for cue in visual_cues:
         cue_str = str(cue)
         # Match [CODE_DISPLAY: anything inside]
-        matches = re.findall(r'\[CODE_DISPLAY:\s*([^\]]+)\]', cue_str, re.IGNORECASE)
+        matches = _CODE_DISPLAY_RE.findall(cue_str)
         code_snippets.extend(matches)
     
     return code_snippets
@@ -71,17 +88,11 @@ def sanitize_script_for_topic(script: str, is_coding: bool = False) -> str:
     """
     if is_coding:
         # For coding topics, keep structure but remove "see code" type phrases
-        script = re.sub(
-            r"(see|look at|check out)\s+(below|the code|code below|here)",
-            "",
-            script,
-            flags=re.IGNORECASE
-        )
-        return script
+        return _SEE_CODE_RE.sub("", script)
     
     # For non-coding topics: aggressive removal
     # Split into sentences
-    sentences = re.split(r'(?<=[.!?])\s+', script)
+    sentences = _SENTENCE_SPLIT_RE.split(script)
     cleaned = []
     
     for sentence in sentences:
@@ -90,19 +101,14 @@ def sanitize_script_for_topic(script: str, is_coding: bool = False) -> str:
             continue
         
         # Check if sentence contains any code-related keyword
-        has_code_mention = any(
-            re.search(pattern, sentence, re.IGNORECASE)
-            for pattern in CODE_MENTION_PATTERNS
-        )
-        
-        if not has_code_mention:
+        if not _CODE_MENTION_RE.search(sentence):
             cleaned.append(sentence)
     
     result = ' '.join(cleaned)
     
     # Remove code blocks
-    result = re.sub(r'```[\s\S]*?```', '', result)
-    result = re.sub(r'`[^`]+`', '', result)
+    result = _CODE_BLOCK_RE.sub('', result)
+    result = _INLINE_CODE_RE.sub('', result)
     
     # Collapse extra whitespace
     result = ' '.join(result.split()).strip()
@@ -125,12 +131,12 @@ def extract_code_snippets_from_script(script: str, limit: int = 3) -> List[str]:
     snippets = []
     
     # Try to extract from triple backticks
-    backtick_matches = re.findall(r'```(?:python|js|javascript|json)?\n([\s\S]*?)```', script)
+    backtick_matches = _FENCED_SNIPPET_RE.findall(script)
     snippets.extend(backtick_matches[:limit])
     
     if len(snippets) < limit:
         # Try [CODE: ...] format
-        code_matches = re.findall(r'\[CODE:\s*([^\]]+)\]', script)
+        code_matches = _CODE_TAG_RE.findall(script)
         snippets.extend(code_matches[:limit - len(snippets)])
     
     return snippets[:limit]
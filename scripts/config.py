@@ -116,6 +116,26 @@ class Config:
         """Optional custom Groq API URL (inference endpoint). If not set, the code will try to use an SDK."""
         return os.getenv('GROQ_API_URL')
     
+    @property
+    def llm_streaming(self) -> bool:
+        """Stream LLM responses so parsing work can start before the last token."""
+        return os.getenv('LLM_STREAMING', 'true').lower() == 'true'
+
+    @property
+    def llm_json_mode(self) -> bool:
+        """Ask the provider for structured JSON output (schema-constrained where supported; opt-in)."""
+        return os.getenv('LLM_JSON_MODE', 'false').lower() == 'true'
+
+    @property
+    def strict_cue_validation(self) -> bool:
+        """Validate model-supplied visual cue timings instead of trusting them."""
+        return os.getenv('STRICT_CUE_VALIDATION', 'false').lower() == 'true'
+
+    @property
+    def llm_max_concurrency(self) -> int:
+        """Maximum concurrent LLM calls when creating scripts in batch."""
+        return int(os.getenv('LLM_MAX_CONCURRENCY', 4))
+
     @property
     def gemini_temperature(self) -> float:
         """Gemini temperature (creativity level)."""
@@ -166,6 +186,11 @@ class Config:
         """TTS speed: 'slow', 'normal', 'fast'."""
         return os.getenv('TTS_SPEED', 'normal')
     
+    @property
+    def tts_concurrency(self) -> int:
+        """Parallel TTS requests per provider when synthesizing [PAUSE] chunks."""
+        return max(1, int(os.getenv('TTS_CONCURRENCY', 4)))
+    
     @property
     def ttsmaker_api_key(self) -> Optional[str]:
         """TTSMaker API key (optional)."""
@@ -282,6 +307,14 @@ class Config:
             path = self.root_dir / path
         return path
     
+    @property
+    def cache_dir(self) -> Path:
+        """Cache directory for reusable LLM/TTS results."""
+        path = Path(os.getenv('CACHE_DIR', './data/cache'))
+        if not path.is_absolute():
+            path = self.root_dir / path
+        return path
+
     # Output subdirectories
     @property
     def videos_dir(self) -> Path:
@@ -364,7 +397,42 @@ class Config:
     def pixabay_api_key(self) -> Optional[str]:
         """Pixabay API key (optional)."""
         return os.getenv('PIXABAY_API_KEY')
-    
+
+    # ========================================================================
+    # SCRIPT CACHE CONFIGURATION
+    # ========================================================================
+
+    @property
+    def semantic_cache_enabled(self) -> bool:
+        """Reuse cached scripts for semantically similar ideas (opt-in: may republish near-duplicates)."""
+        return os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+
+    @property
+    def semantic_cache_threshold(self) -> float:
+        """Minimum cosine similarity for a semantic cache hit."""
+        yaml_val = self._get_nested(self._config, 'cache.semantic_threshold')
+        return float(yaml_val or os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.92))
+
+    @property
+    def generative_cache_enabled(self) -> bool:
+        """Fill stored script templates for structurally identical ideas (opt-in)."""
+        return os.getenv('GENERATIVE_CACHE_ENABLED', 'false').lower() == 'true'
+
+    @property
+    def script_cache_max_entries(self) -> int:
+        """Most scripts/templates each script cache keeps before dropping the oldest."""
+        return max(1, int(os.getenv('SCRIPT_CACHE_MAX_ENTRIES', 500)))
+
+    @property
+    def tts_cache_enabled(self) -> bool:
+        """Serve repeated TTS phrases from the on-disk audio cache."""
+        return os.getenv('TTS_CACHE_ENABLED', 'true').lower() == 'true'
+
+    @property
+    def tts_cache_max_mb(self) -> int:
+        """Size cap of the TTS audio cache before LRU eviction (MB)."""
+        return int(os.getenv('TTS_CACHE_MAX_MB', 500))
+
     # ========================================================================
     # UTILITY METHODS
     # ========================================================================
@@ -391,6 +459,7 @@ class Config:
             self.metadata_dir,
             self.audio_dir,
             self.stock_footage_dir,
+            self.cache_dir,
         ]
         
         for dir_path in dirs:
@@ -1,11 +1,21 @@
 # FILE: scripts/idea_generator.py
 # Generate viral YouTube Shorts ideas using Google Gemini
 
+import re
 import json
 from typing import List, Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.llm import generate as llm_generate
 from scripts.config import get_config
 
+# Optional ```/```json fence around the model's JSON, matched in one pass
+_FENCE_RE = re.compile(r'\s*```(?:json)?\s*(.*?)\s*(?:```|\Z)', re.DOTALL)
+
 
 class IdeaGenerator:
     """Generate viral YouTube Shorts ideas for tech/coding niche."""
@@ -137,18 +147,13 @@ Example format (not the actual content):
             List of parsed ideas
         """
         try:
-            # Clean up response
-            json_str = response_text.strip()
-            
-            # Remove markdown code blocks if present
-            if json_str.startswith('```'):
-                json_str = json_str.split('```')[1]
-                if json_str.startswith('json'):
-                    json_str = json_str[4:]
-                json_str = json_str.strip()
+            # Clean up response and extract JSON from an optional ``` fence
+            m = _FENCE_RE.match(response_text)
+            json_str = m.group(1) if m else response_text.strip()
             
             # Parse JSON
-            ideas = json.loads(json_str)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            ideas = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
             
             # Validate structure
             if not isinstance(ideas, list):
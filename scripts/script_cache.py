@@ -0,0 +1,525 @@
+# FILE: scripts/script_cache.py
+# Semantic and template caches for generated Shorts scripts
+
+"""
+Cache LLM-generated scripts so that paraphrased ideas ("Python List Trick" vs
+"Save time with list comprehensions") reuse an earlier script instead of
+paying for another LLM round-trip.
+
+Each idea is embedded from ``title + hook + body + topic`` and compared with
+previous entries by cosine similarity. A hit is only returned when the
+similarity reaches the configured threshold AND the cached entry was created
+for the same topic (a paraphrase about a different topic must never reuse a
+script).
+
+Embeddings use ``sentence-transformers`` (all-MiniLM-L6-v2) when it is
+installed; otherwise a dependency-free hashed n-gram vector of the same
+dimension is used. Entries live in a SQLite database under
+``config.cache_dir``: each store is a single-row insert, so worker processes
+sharing the directory add to the cache instead of overwriting each other's
+entries. Once the cache holds ``max_entries`` scripts the oldest are dropped.
+
+``GenerativeScriptCache`` complements it for structurally identical ideas:
+it stores the LLM response as a template whose idea-specific text is
+replaced by slot placeholders, keyed by topic/difficulty/duration, and fills
+the slots for the next idea of the same shape.
+"""
+
+import copy
+import difflib
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+from scripts.config import get_config
+from scripts.utils import extract_keywords
+
+
+EMBEDDING_DIM = 384
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+CACHE_FILENAME = 'semantic_script_cache.sqlite3'
+TEMPLATE_FILENAME = 'script_templates.sqlite3'
+DEFAULT_MAX_ENTRIES = 500
+# Seconds a writer waits for another process's transaction to finish
+SQLITE_TIMEOUT_SECONDS = 30
+
+# Idea fields that are substituted into templates
+TEMPLATE_SLOTS = ('title', 'hook', 'body', 'cta')
+# Script fields that may carry idea-specific text
+TEMPLATE_TEXT_FIELDS = ('script', 'marketing_title', 'description_for_upload')
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def idea_text(idea: Dict[str, Any], topic: str = '') -> str:
+    """Build the text that represents an idea for embedding."""
+    parts = [idea.get('title'), idea.get('hook'), idea.get('body'), topic]
+    return ' '.join(str(p) for p in parts if p)
+
+
+def idea_hash(idea: Dict[str, Any], topic: str = '') -> str:
+    """Exact-match key over every idea field that shapes the script."""
+    payload = {k: idea.get(k) for k in ('title', 'hook', 'body', 'cta', 'difficulty')}
+    payload['topic'] = (topic or '').lower()
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _substitute_idea_fields(script_data: Dict[str, Any], old: Dict[str, Any], new: Dict[str, Any]):
+    """Swap the cached idea's title/CTA wording for the new idea's in text fields."""
+    pairs = []
+    for field in ('title', 'cta'):
+        old_val = str(old.get(field) or '').strip()
+        new_val = str(new.get(field) or '').strip()
+        if old_val and new_val and old_val != new_val:
+            pairs.append((old_val, new_val))
+    if not pairs:
+        return
+
+    def swap(text: str) -> str:
+        for old_val, new_val in pairs:
+            text = text.replace(old_val, new_val)
+        return text
+
+    for field in ('script', 'marketing_title', 'description_for_upload'):
+        if isinstance(script_data.get(field), str):
+            script_data[field] = swap(script_data[field])
+    for cue in script_data.get('visual_cues') or []:
+        if isinstance(cue, dict) and isinstance(cue.get('content'), str):
+            cue['content'] = swap(cue['content'])
+
+
+def _connect(path: Path, schema: str) -> sqlite3.Connection:
+    """Open (and if needed create) a cache database.
+
+    The connection is shared by the cache's threads under its own lock;
+    SQLite's file locking serializes writers from other processes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=SQLITE_TIMEOUT_SECONDS, check_same_thread=False)
+    with conn:
+        conn.execute(schema)
+    return conn
+
+
+def _trim_oldest(conn: sqlite3.Connection, table: str, max_entries: int):
+    """Drop all but the newest `max_entries` rows (`seq` only grows)."""
+    conn.execute(
+        f"DELETE FROM {table} WHERE seq NOT IN (SELECT seq FROM {table} ORDER BY seq DESC LIMIT ?)",
+        (max_entries,),
+    )
+
+
+def _hashed_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """
+    Embed text as a normalized bag of hashed word unigrams/bigrams and
+    character trigrams. Cheap, deterministic and good enough to catch
+    near-duplicate wording when no sentence model is installed.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = list(tokens)
+    features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    for tok in tokens:
+        padded = f"#{tok}#"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    vec = [0.0] * dim
+    for feat in features:
+        digest = hashlib.md5(feat.encode('utf-8')).digest()
+        idx = int.from_bytes(digest[:4], 'little') % dim
+        vec[idx] += 1.0 if digest[4] & 1 else -1.0
+
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm == 0:
+        return vec
+    return [v / norm for v in vec]
+
+
+class SemanticScriptCache:
+    """Embedding-keyed cache of script dictionaries, persisted to disk."""
+
+    def __init__(self, cache_dir: Path, threshold: float = 0.92, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            cache_dir: Directory holding the cache file
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Most entries kept; the oldest are dropped beyond it
+        """
+        self.path = Path(cache_dir) / CACHE_FILENAME
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._model = None
+        self._backend = 'minilm' if SentenceTransformer is not None else 'hashed'
+        self._conn: Optional[sqlite3.Connection] = None
+        # Snapshot of the stored vectors for similarity search, rebuilt when
+        # the database changes; _version is the PRAGMA data_version it saw
+        self._rows: List[Dict[str, Any]] = []
+        self._matrix = None
+        self._version: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    def embed(self, text: str) -> List[float]:
+        """Return a unit-length embedding for ``text``."""
+        if self._backend == 'minilm':
+            if self._model is None:
+                self._model = SentenceTransformer(SENTENCE_MODEL_NAME)
+            vec = self._model.encode(text, normalize_embeddings=True)
+            return [float(v) for v in vec]
+        return _hashed_embedding(text)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect(self.path, """
+                CREATE TABLE IF NOT EXISTS entries (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL UNIQUE,
+                    backend TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    title TEXT,
+                    cta TEXT,
+                    vector BLOB NOT NULL,
+                    script TEXT NOT NULL
+                )""")
+        return self._conn
+
+    def _snapshot(self):
+        """Return (rows, vectors) of this backend's entries, oldest first.
+
+        Vectors from a different embedding backend are not comparable and
+        are skipped. The snapshot is reused until PRAGMA data_version shows a
+        commit from another connection (our own stores reset it directly).
+        """
+        conn = self._db()
+        version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if self._matrix is None or version != self._version:
+            cursor = conn.execute(
+                'SELECT seq, topic, title, cta, vector FROM entries WHERE backend = ? ORDER BY seq',
+                (self._backend,),
+            )
+            self._rows, vectors = [], []
+            for seq, topic, title, cta, blob in cursor:
+                self._rows.append({'seq': seq, 'topic': topic, 'title': title, 'cta': cta})
+                vectors.append(blob)
+            if np is not None:
+                self._matrix = np.frombuffer(b''.join(vectors), dtype=np.float32).reshape(len(vectors), EMBEDDING_DIM)
+            else:
+                self._matrix = [array('f', blob) for blob in vectors]
+            self._version = version
+        return self._rows, self._matrix
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _best_match(vec: List[float], matrix):
+        """Return (index, similarity) of the closest stored vector (IndexFlatIP search, k=1)."""
+        if np is not None:
+            scores = matrix @ np.asarray(vec, dtype=np.float32)
+            idx = int(np.argmax(scores))
+            return idx, float(scores[idx])
+
+        best_idx, best_score = -1, -1.0
+        for i, stored in enumerate(matrix):
+            score = sum(a * b for a, b in zip(vec, stored))
+            if score > best_score:
+                best_idx, best_score = i, score
+        return best_idx, best_score
+
+    def lookup(self, idea: Dict[str, Any], topic: str = '') -> Optional[Dict[str, Any]]:
+        """
+        Find a cached script for an idea.
+
+        Identical ideas are answered from an exact-hash index without
+        computing an embedding. Semantic hits get the new idea's title and
+        CTA substituted for the cached idea's wording.
+
+        Args:
+            idea: Idea dictionary
+            topic: Topic/category (must match the cached entry exactly)
+
+        Returns:
+            A copy of the cached script data, or None on a miss
+        """
+        key = idea_hash(idea, topic)
+        with self._lock:
+            try:
+                conn = self._db()
+                row = conn.execute(
+                    'SELECT script FROM entries WHERE key = ? AND backend = ?', (key, self._backend)
+                ).fetchone()
+                if row is not None:
+                    return json.loads(row[0])
+                rows, matrix = self._snapshot()
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to read script cache {self.path}: {e}")
+                return None
+            if not rows:
+                return None
+
+        vec = self.embed(idea_text(idea, topic))
+        idx, score = self._best_match(vec, matrix)
+        if idx < 0 or score < self.threshold:
+            return None
+        entry = rows[idx]
+        # Critical-entity guard: never reuse a script across topics
+        if (entry.get('topic') or '').lower() != (topic or '').lower():
+            return None
+        with self._lock:
+            try:
+                row = conn.execute('SELECT script FROM entries WHERE seq = ?', (entry['seq'],)).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to read script cache {self.path}: {e}")
+                return None
+        if row is None:
+            # Dropped by another process since the snapshot
+            return None
+        print(f"♻️ Semantic cache hit ({score:.3f}) for: {idea.get('title')}")
+        script_data = json.loads(row[0])
+        _substitute_idea_fields(script_data, entry, idea)
+        return script_data
+
+    def store(self, idea: Dict[str, Any], topic: str, script_data: Dict[str, Any]):
+        """Add a freshly generated script to the cache and persist it."""
+        row = (
+            idea_hash(idea, topic),
+            self._backend,
+            topic or '',
+            idea.get('title'),
+            idea.get('cta'),
+            array('f', self.embed(idea_text(idea, topic))).tobytes(),
+            json.dumps(script_data),
+        )
+        with self._lock:
+            try:
+                conn = self._db()
+                with conn:
+                    # REPLACE gives a re-stored idea a new (newest) seq
+                    conn.execute(
+                        'INSERT OR REPLACE INTO entries (key, backend, topic, title, cta, vector, script) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        row,
+                    )
+                    _trim_oldest(conn, 'entries', self.max_entries)
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to persist script cache {self.path}: {e}")
+            self._matrix = None
+
+
+def _slot_marker(slot: str) -> str:
+    return f"{{{{slot:{slot}}}}}"
+
+
+def _find_slot_span(text: str, value: str):
+    """
+    Locate ``value`` inside ``text`` allowing light rewording.
+
+    Uses the longest common block between both strings and accepts it when
+    it covers at least 80% of ``value``. Returns (start, end) or None.
+    """
+    if not value or not text:
+        return None
+    idx = text.lower().find(value.lower())
+    if idx >= 0:
+        return idx, idx + len(value)
+    matcher = difflib.SequenceMatcher(None, text.lower(), value.lower(), autojunk=False)
+    block = matcher.find_longest_match(0, len(text), 0, len(value))
+    if block.size >= 0.8 * len(value):
+        return block.a, block.a + block.size
+    return None
+
+
+class GenerativeScriptCache:
+    """Template cache keyed by idea structure (topic, difficulty, duration)."""
+
+    def __init__(self, cache_dir: Path, min_coverage: float = 0.8, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            cache_dir: Directory holding the template file
+            min_coverage: Minimum share of narration words that must come from
+                idea slots for a response to be stored as a template
+            max_entries: Most templates kept; the oldest are dropped beyond it
+        """
+        self.path = Path(cache_dir) / TEMPLATE_FILENAME
+        self.min_coverage = min_coverage
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def key_for(idea: Dict[str, Any], topic: str, duration_seconds: int) -> str:
+        """Structural key: sha256(topic + difficulty + duration)."""
+        raw = f"{(topic or '').lower()}|{idea.get('difficulty', 'beginner')}|{int(duration_seconds)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect(self.path, """
+                CREATE TABLE IF NOT EXISTS templates (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL UNIQUE,
+                    template TEXT NOT NULL
+                )""")
+        return self._conn
+
+    def _templatize(self, text: str, idea: Dict[str, Any]):
+        """Replace idea slot values in ``text``; return (template, covered_chars)."""
+        covered = 0
+        for slot in TEMPLATE_SLOTS:
+            value = str(idea.get(slot) or '').strip()
+            span = _find_slot_span(text, value)
+            if span is None:
+                continue
+            start, end = span
+            covered += end - start
+            text = text[:start] + _slot_marker(slot) + text[end:]
+        return text, covered
+
+    def store(
+        self,
+        idea: Dict[str, Any],
+        topic: str,
+        duration_seconds: int,
+        script_data: Dict[str, Any],
+    ) -> bool:
+        """
+        Derive a template from a fresh LLM response and store it when the
+        idea slots cover enough of the narration.
+
+        Returns:
+            True if a template was stored
+        """
+        script_text = script_data.get('script') or ''
+        templated_script, covered = self._templatize(script_text, idea)
+        narration = script_text.replace('[PAUSE]', '')
+        if not narration.strip() or covered / len(narration) < self.min_coverage:
+            return False
+
+        template = copy.deepcopy(script_data)
+        template['script'] = templated_script
+        for field in TEMPLATE_TEXT_FIELDS[1:]:
+            if isinstance(template.get(field), str):
+                template[field] = self._templatize(template[field], idea)[0]
+        for cue in template.get('visual_cues') or []:
+            if isinstance(cue, dict) and isinstance(cue.get('content'), str):
+                cue['content'] = self._templatize(cue['content'], idea)[0]
+        template.pop('keywords', None)
+
+        with self._lock:
+            try:
+                conn = self._db()
+                with conn:
+                    # REPLACE gives a re-stored template a new (newest) seq
+                    conn.execute(
+                        'INSERT OR REPLACE INTO templates (key, template) VALUES (?, ?)',
+                        (self.key_for(idea, topic, duration_seconds), json.dumps(template)),
+                    )
+                    _trim_oldest(conn, 'templates', self.max_entries)
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to persist script templates {self.path}: {e}")
+                return False
+        return True
+
+    def lookup(
+        self,
+        idea: Dict[str, Any],
+        topic: str,
+        duration_seconds: int,
+    ) -> Optional[Dict[str, Any]]:
+        """Render a stored template for ``idea``, or return None on a miss."""
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    'SELECT template FROM templates WHERE key = ?',
+                    (self.key_for(idea, topic, duration_seconds),),
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to read script templates {self.path}: {e}")
+                return None
+        if row is None:
+            return None
+
+        # Every slot used by the template must be available on this idea
+        blob = row[0]
+        template = json.loads(blob)
+        values = {}
+        for slot in TEMPLATE_SLOTS:
+            if _slot_marker(slot) in blob:
+                value = str(idea.get(slot) or '').strip()
+                if not value:
+                    return None
+                values[slot] = value
+
+        def render(text: str) -> str:
+            for slot, value in values.items():
+                text = text.replace(_slot_marker(slot), value)
+            return text
+
+        script_data = template
+        for field in TEMPLATE_TEXT_FIELDS:
+            if isinstance(script_data.get(field), str):
+                script_data[field] = render(script_data[field])
+        for cue in script_data.get('visual_cues') or []:
+            if isinstance(cue, dict) and isinstance(cue.get('content'), str):
+                cue['content'] = render(cue['content'])
+
+        script_data['keywords'] = extract_keywords(script_data['script'])
+        print(f"♻️ Script template reused for: {idea.get('title')}")
+        return script_data
+
+
+_cache_instance: Optional[SemanticScriptCache] = None
+_template_cache_instance: Optional[GenerativeScriptCache] = None
+
+
+def get_script_cache() -> Optional[SemanticScriptCache]:
+    """Get the semantic script cache singleton, or None when disabled."""
+    global _cache_instance
+    config = get_config()
+    if not config.semantic_cache_enabled:
+        return None
+    if _cache_instance is None:
+        _cache_instance = SemanticScriptCache(
+            config.cache_dir,
+            threshold=config.semantic_cache_threshold,
+            max_entries=config.script_cache_max_entries,
+        )
+    return _cache_instance
+
+
+def get_template_cache() -> Optional[GenerativeScriptCache]:
+    """Get the generative template cache singleton, or None when disabled."""
+    global _template_cache_instance
+    config = get_config()
+    if not config.generative_cache_enabled:
+        return None
+    if _template_cache_instance is None:
+        _template_cache_instance = GenerativeScriptCache(
+            config.cache_dir,
+            max_entries=config.script_cache_max_entries,
+        )
+    return _template_cache_instance
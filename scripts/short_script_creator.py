@@ -2,9 +2,21 @@
 # Convert viral ideas into optimized YouTube Shorts scripts
 
 import sys
+import re
+import asyncio
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Fix UTF-8 encoding for Windows terminals
 if sys.platform == 'win32':
@@ -14,13 +26,255 @@ if sys.platform == 'win32':
     except Exception:
         pass
 
-from src.llm import generate as llm_generate
+from src.llm import generate as llm_generate, agenerate as llm_agenerate, warm_up as llm_warm_up
 from scripts.config import get_config
-from scripts.utils import extract_keywords
+from scripts.utils import extract_keywords, extract_keywords_batch
+from scripts.code_utils import (
+    sanitize_script_for_topic,
+    is_coding_topic,
+    extract_code_markers,
+    extract_code_snippets_from_script,
+)
+from scripts.script_cache import get_script_cache, get_template_cache, idea_hash
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Matches a fully received "script" string value in a partial JSON response
+_SCRIPT_FIELD_RE = re.compile(r'"script"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Leading markdown code fence (```json ... ```) around a JSON response
+_FENCE_RE = re.compile(r'\s*```(?:json)?\s*(.*?)\s*(?:```|\Z)', re.DOTALL)
+
+# Either a [PAUSE] token or a word (a run of non-space characters that stops
+# at a glued-on [PAUSE]); one scan yields both the cue chunks and word counts
+_CUE_TOKEN_RE = re.compile(r'\[PAUSE\]|(?:(?!\[PAUSE\])\S)+')
+# Code-snippet heuristics used by the sanitizer in _parse_response
+_ASSIGN_SNIPPET_RE = re.compile(r"[A-Za-z0-9_\[\]\(\),\s]+\s*=\s*[^\n\.;]{1,120}")
+_ASSIGN_CANDIDATE_RE = re.compile(r"[A-Za-z0-9_\[\]\(\),\s]+\s*=\s*[^\n\.;]{1,200}")
+_LEADING_PAUSE_RE = re.compile(r"^\[PAUSE\]\s*", re.IGNORECASE)
+_LEADING_FILLER_RE = re.compile(r"^(just\s+|write\s+|use\s+|try\s+)", re.IGNORECASE)
+_LEADING_IN_PYTHON_RE = re.compile(r"^in\s+python[,:\s]+", re.IGNORECASE)
+
+_keyword_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON with orjson when installed, falling back to the stdlib."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    """Serialize to indented JSON with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2)
+
+
+def _cues_complete(cues: Any) -> bool:
+    """True when every cue is a dict that carries a start time."""
+    return bool(cues) and isinstance(cues, list) and all(
+        isinstance(v, dict) and 'time_seconds' in v for v in cues
+    )
+
+
+def _backfill_cues(cues: Any) -> bool:
+    """
+    Trust model-supplied cues, only defaulting missing timings (3s slots).
+
+    Returns:
+        False if there are no usable cues, so the caller derives them
+    """
+    if not isinstance(cues, list) or not cues:
+        return False
+    for i, v in enumerate(cues):
+        if not isinstance(v, dict):
+            return False
+        v.setdefault('time_seconds', i * 3)
+        v.setdefault('duration_seconds', 3)
+    return True
+
+
+def _fill_cue_durations(cues: list, total_duration: float) -> bool:
+    """
+    Fill missing `duration_seconds` with the gap to the next cue (or to the
+    end of the video for the last cue).
+
+    Returns:
+        False if the cue times are not numeric, so the caller can rebuild cues
+    """
+    if all('duration_seconds' in v for v in cues):
+        return True
+    try:
+        times = np.array([float(v['time_seconds']) for v in cues] + [float(total_duration)])
+    except (TypeError, ValueError):
+        return False
+    gaps = np.diff(times)
+    for i, v in enumerate(cues):
+        if 'duration_seconds' not in v:
+            v['duration_seconds'] = round(float(max(0.5, gaps[i])), 2)
+    return True
+
+
+def _split_narration(script: str) -> Tuple[List[str], List[int]]:
+    """
+    Split narration on [PAUSE] in a single pass.
+
+    Returns the trimmed, non-empty chunks and the word count of each.
+    """
+    chunks: List[str] = []
+    counts: List[int] = []
+    start = end = -1
+    words = 0
+    for m in _CUE_TOKEN_RE.finditer(script):
+        if m.group() == '[PAUSE]':
+            if words:
+                chunks.append(script[start:end])
+                counts.append(words)
+            words = 0
+            continue
+        if not words:
+            start = m.start()
+        end = m.end()
+        words += 1
+    if words:
+        chunks.append(script[start:end])
+        counts.append(words)
+    return chunks, counts
+
+
+def _get_keyword_executor() -> ThreadPoolExecutor:
+    """Background pool used to extract keywords while the LLM is still streaming."""
+    global _keyword_executor
+    if _keyword_executor is None:
+        _keyword_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='keywords')
+    return _keyword_executor
+
+
+class _ScriptStreamWatcher:
+    """
+    Accumulate streamed LLM chunks and start keyword extraction as soon as the
+    `script` field of the JSON response is complete.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self.script: Optional[str] = None
+        self.keywords_future: Optional[Future] = None
+
+    def __call__(self, chunk: str):
+        self._parts.append(chunk)
+        if self.script is not None or '"' not in chunk:
+            return
+        match = _SCRIPT_FIELD_RE.search(''.join(self._parts))
+        if not match:
+            return
+        try:
+            self.script = _json_loads(f'"{match.group(1)}"')
+        except json.JSONDecodeError:
+            return
+        self.keywords_future = _get_keyword_executor().submit(extract_keywords, self.script)
+
+    def keywords_for(self, script_text: str):
+        """Return prefetched keywords if they were computed for `script_text`."""
+        if self.keywords_future is None or self.script != script_text:
+            return None
+        try:
+            return self.keywords_future.result()
+        except Exception:
+            return None
+
+
+# Viral-style 30s Short structure prompt. Request explicit [PAUSE] tokens
+# and per-cue timing. Output must be valid JSON only and follow the
+# exact schema described.
+# IMPORTANT: The model must NOT reference code that isn't present in the
+# video. Do NOT use phrases like "see code below", "I'll show the code",
+# or "code sample below" unless the environment variable
+# `ALLOW_CODE_IN_DESCRIPTION` is set to true. If code cannot be provided,
+# do not mention it.
+# Static scaffolding shared by every call. Dynamic values (idea fields,
+# duration, word estimate) are only appended after it so the prefix is
+# byte-identical across calls and providers can reuse their prefix cache.
+_PROMPT_PREFIX = """You are a top-tier short-form creator and growth marketer. Produce a voice-first, 30-second YouTube Short script optimized for attention, retention, and virality.
+Output JSON only. Produce a single JSON object with keys: "script", "duration_seconds", "estimated_word_count", "visual_cues", "keywords", "reading_notes", "difficulty", "marketing_title", "description_for_upload", "seo_hashtags".
+
+Constraints (follow exactly):
+- Total `duration_seconds`: the Target duration_seconds given under Input (do not change).
+- `script`: Spoken-first narration. Structure it into three beats:
+    1) HOOK (0–3s): One gripping sentence (emotion, surprise, or fact). End with [PAUSE].
+    2) CORE MESSAGE (4–20s): 3–5 short sentences (each 4–10 words). Put [PAUSE] between each sentence.
+    3) PAYOFF / CTA (21–30s): 1–2 sentences that transform or call-to-action. End with [PAUSE].
+- Use [PAUSE] tokens to indicate intentional breath/pause points for TTS.
+- `estimated_word_count`: integer, approx the Target estimated_word_count given under Input.
+
+Visual cues:
+- Provide `visual_cues` as a list of objects with keys: `time_seconds` (number), `duration_seconds` (number), `type` (one of "text","b-roll","screenshot","image"), `content` (short on-screen text or description), and optional `transition` ("fade","zoom","slide").
+- Visual cues must align with the narration and cover each beat. Vary types across the video.
+
+Reading notes:
+- Provide `reading_notes` with speaking_rate ("normal"/"slower"), tone (e.g., "confident"), and emphasize words/phrases separated by commas.
+
+Keywords & difficulty:
+- Provide `keywords` array and `difficulty` string ("beginner"/"intermediate").
+
+SEO & marketing fields (important):
+- `marketing_title`: A sticky, curiosity-driven title under 60 characters optimized for click-throughs. Include 1 emoji if helpful.
+- `description_for_upload`: A ready-to-paste YouTube description (max 5000 chars). Include a 1-2 sentence summary, a short CTA, and a list of hashtags (space-separated). If you cannot include code, do NOT mention code in this field.
+- `seo_hashtags`: Provide a short array of 6-12 high-impact hashtags (no spaces in tags) prioritized by relevance.
+
+Safety & code policy:
+- DO NOT include or promise code unless `ALLOW_CODE_IN_DESCRIPTION` is enabled. If enabled, include a very short (<=10 lines) code snippet string under `code_snippet` (escaped) and include it in `description_for_upload`. Otherwise, never refer to code or say it will be shown.
+
+Example minimal `visual_cues` item:
+{"time_seconds":0, "duration_seconds":3, "type":"text", "content":"⚡ QUICK TECH HACK", "transition":"zoom"}
+
+"""
+# Shape of the script JSON described in the prompt, used for structured output
+SCRIPT_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'script': {'type': 'string'},
+        'duration_seconds': {'type': 'integer'},
+        'estimated_word_count': {'type': 'integer'},
+        'visual_cues': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'time_seconds': {'type': 'number'},
+                    'duration_seconds': {'type': 'number'},
+                    'type': {'type': 'string', 'enum': ['text', 'b-roll', 'screenshot', 'image']},
+                    'content': {'type': 'string'},
+                    'transition': {'type': 'string', 'enum': ['fade', 'zoom', 'slide']},
+                },
+                'required': ['time_seconds', 'duration_seconds', 'type', 'content'],
+            },
+        },
+        'keywords': {'type': 'array', 'items': {'type': 'string'}},
+        'reading_notes': {
+            'type': 'object',
+            'properties': {
+                'speaking_rate': {'type': 'string'},
+                'tone': {'type': 'string'},
+                'emphasize': {'type': 'string'},
+            },
+        },
+        'difficulty': {'type': 'string'},
+        'marketing_title': {'type': 'string'},
+        'description_for_upload': {'type': 'string'},
+        'seo_hashtags': {'type': 'array', 'items': {'type': 'string'}},
+        'code_snippet': {'type': 'string'},
+    },
+    'required': ['script', 'duration_seconds', 'estimated_word_count', 'visual_cues', 'keywords'],
+}
+
+_PROMPT_TAIL = """
+
+Return only the JSON object. No commentary, no markdown, exact JSON shape requested."""
+
 
 class ShortScriptCreator:
     """Create YouTube Shorts-optimized scripts from ideas."""
@@ -30,12 +284,15 @@ class ShortScriptCreator:
         config = get_config()
         # We no longer require Gemini specifically; the LLM provider is configurable.
         self.config = config
+        # Model is resolved once per creator rather than on every call
+        self._model_name = config.groq_model if config.llm_provider == 'groq' else config.gemini_model
     
     def create_script(
         self,
         idea: Dict[str, Any],
         topic: str = '',
         duration_seconds: Optional[int] = None,
+        defer_keywords: bool = False,
     ) -> Dict[str, Any]:
         """
         Create a Shorts-optimized script from an idea.
@@ -44,133 +301,170 @@ class ShortScriptCreator:
             idea: Idea dictionary from IdeaGenerator
             topic: Topic/category
             duration_seconds: Target duration (uses config if not provided)
+            defer_keywords: Leave 'keywords' unset when the model gave none;
+                the batch methods extract them for all scripts at once
             
         Returns:
             Script dictionary with script text, metadata, and visual cues
         """
         if duration_seconds is None:
             duration_seconds = self.config.video_duration_seconds
+
+        cached = self._cached_script(idea, topic, duration_seconds)
+        if cached is not None:
+            return cached
         
-        prompt = self._create_prompt(idea, topic, duration_seconds)
+        prompt = self._prompt_suffix(idea, topic, duration_seconds)
         
         try:
             # Use the LLM adapter which supports both Gemini and Groq
-            model_name = self.config.groq_model if self.config.llm_provider == 'groq' else self.config.gemini_model
-            response = llm_generate(prompt, model=model_name)
-            script_data = self._parse_response(response.text, duration_seconds, idea, topic)
-            return script_data
+            watcher, llm_kwargs = self._llm_call_options()
+            response = llm_generate(prompt, **llm_kwargs)
+            return self._finish_script(response.text, duration_seconds, idea, topic, watcher, defer_keywords)
         except Exception as e:
             print(f"❌ ERROR: Failed to create script for idea '{idea.get('title')}': {e}")
             # User requested to be notified if Gemini fails, rather than using a fallback.
             raise RuntimeError(f"Gemini API Error: {e}. Please check your API key.")
 
-
-            # Build sections: Hook, 3 points with examples, Short demo/example, CTA
-            hook = idea.get('hook') or f"Stop doing this in {topic}!"
-            body = idea.get('body') or f"Here is a critical tip about {topic} that you need to know."
-            cta = idea.get('cta') or 'Subscribe for more coding tips!'
-
-            # Create a more structured fallback script
-            script_parts = [
-                f"{hook} [PAUSE]",
-                f"Many developers struggle with {topic}, but here is the fix.",
-                f"{body}",
-                "Let me show you how it works in practice. [PAUSE]",
-                "Notice how much cleaner this code is?",
-                "This simple change can save you hours of debugging.",
-                f"{cta}"
-            ]
-            
-            # Join and pad if necessary
-            script_text = " ".join(script_parts)
-            current_words = len(script_text.split())
-            
-            if current_words < estimated_words:
-                 padding = "It really is that simple. Try it out in your next project and see the difference."
-                 script_text += f" {padding}"
-
-            # Create visual cues
-            visual_cues = [
-                {"time_seconds": 0, "cue": f"Big Red Text: {hook}"},
-                {"time_seconds": 5, "cue": "Screen recording of code editor"},
-                {"time_seconds": 15, "cue": "Highlighting the fix in code"},
-                {"time_seconds": 25, "cue": "Arrow pointing to Subscribe button"}
-            ]
-
-            return {
-                "script": script_text,
-                "duration_seconds": duration_seconds,
-                "estimated_word_count": estimated_words,
-                "visual_cues": visual_cues,
-                "keywords": extract_keywords(script_text),
-                "reading_notes": "Urgent, high energy.",
-                "difficulty": idea.get('difficulty','beginner')
-            }
-    
-    def _create_prompt(
+    async def acreate_script(
         self,
         idea: Dict[str, Any],
-        topic: str,
-        duration: int,
-    ) -> str:
-                """
-                Create the LLM prompt for viral-style short script generation.
-
-                Returns a string prompt configured for the requested duration.
-                """
-                # Estimate words: use slightly faster rate for Shorts
-                estimated = self._estimate_word_count(duration)
-
-                # Viral-style 30s Short structure prompt. Request explicit [PAUSE] tokens
-                # and per-cue timing. Output must be valid JSON only and follow the
-                # exact schema described.
-                # IMPORTANT: The model must NOT reference code that isn't present in the
-                # video. Do NOT use phrases like "see code below", "I'll show the code",
-                # or "code sample below" unless the environment variable
-                # `ALLOW_CODE_IN_DESCRIPTION` is set to true. If code cannot be provided,
-                # do not mention it.
-                return f"""You are a top-tier short-form creator and growth marketer. Produce a voice-first, 30-second YouTube Short script optimized for attention, retention, and virality.
-Output JSON only. Produce a single JSON object with keys: "script", "duration_seconds", "estimated_word_count", "visual_cues", "keywords", "reading_notes", "difficulty", "marketing_title", "description_for_upload", "seo_hashtags".
-
-Constraints (follow exactly):
-- Total `duration_seconds`: {duration} (do not change).
-- `script`: Spoken-first narration. Structure it into three beats:
-    1) HOOK (0–3s): One gripping sentence (emotion, surprise, or fact). End with [PAUSE].
-    2) CORE MESSAGE (4–20s): 3–5 short sentences (each 4–10 words). Put [PAUSE] between each sentence.
-    3) PAYOFF / CTA (21–30s): 1–2 sentences that transform or call-to-action. End with [PAUSE].
-- Use [PAUSE] tokens to indicate intentional breath/pause points for TTS.
-- `estimated_word_count`: integer, approx {estimated} words.
-
-Visual cues:
-- Provide `visual_cues` as a list of objects with keys: `time_seconds` (number), `duration_seconds` (number), `type` (one of "text","b-roll","screenshot","image"), `content` (short on-screen text or description), and optional `transition` ("fade","zoom","slide").
-- Visual cues must align with the narration and cover each beat. Vary types across the video.
-
-Reading notes:
-- Provide `reading_notes` with speaking_rate ("normal"/"slower"), tone (e.g., "confident"), and emphasize words/phrases separated by commas.
+        topic: str = '',
+        duration_seconds: Optional[int] = None,
+        defer_keywords: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of `create_script`; the LLM call runs without blocking
+        the event loop so several scripts can be generated concurrently.
+        Cache lookups (embedding, file I/O) and response parsing run in
+        worker threads for the same reason.
+        """
+        if duration_seconds is None:
+            duration_seconds = self.config.video_duration_seconds
 
-Keywords & difficulty:
-- Provide `keywords` array and `difficulty` string ("beginner"/"intermediate").
+        cached = await asyncio.to_thread(self._cached_script, idea, topic, duration_seconds)
+        if cached is not None:
+            return cached
 
-SEO & marketing fields (important):
-- `marketing_title`: A sticky, curiosity-driven title under 60 characters optimized for click-throughs. Include 1 emoji if helpful.
-- `description_for_upload`: A ready-to-paste YouTube description (max 5000 chars). Include a 1-2 sentence summary, a short CTA, and a list of hashtags (space-separated). If you cannot include code, do NOT mention code in this field.
-- `seo_hashtags`: Provide a short array of 6-12 high-impact hashtags (no spaces in tags) prioritized by relevance.
+        prompt = self._prompt_suffix(idea, topic, duration_seconds)
 
-Safety & code policy:
-- DO NOT include or promise code unless `ALLOW_CODE_IN_DESCRIPTION` is enabled. If enabled, include a very short (<=10 lines) code snippet string under `code_snippet` (escaped) and include it in `description_for_upload`. Otherwise, never refer to code or say it will be shown.
+        try:
+            watcher, llm_kwargs = self._llm_call_options()
+            response = await llm_agenerate(prompt, **llm_kwargs)
+            return await asyncio.to_thread(
+                self._finish_script, response.text, duration_seconds, idea, topic, watcher, defer_keywords
+            )
+        except Exception as e:
+            print(f"❌ ERROR: Failed to create script for idea '{idea.get('title')}': {e}")
+            raise RuntimeError(f"Gemini API Error: {e}. Please check your API key.")
 
-Input Idea:
-Title: {idea.get('title')}
-Hook Concept: {idea.get('hook')}
-Core Value: {idea.get('body')}
-CTA: {idea.get('cta')}
+    def _cached_script(
+        self,
+        idea: Dict[str, Any],
+        topic: str,
+        duration_seconds: int,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a script from the semantic or template cache, if any."""
+        # Paraphrased ideas on the same topic reuse an earlier script
+        cache = get_script_cache()
+        if cache is not None:
+            cached = cache.lookup(idea, topic)
+            if cached is not None:
+                cached['duration_seconds'] = int(duration_seconds)
+                return cached
+
+        # Ideas sharing topic/difficulty/duration can fill a stored template
+        templates = get_template_cache()
+        if templates is not None:
+            return templates.lookup(idea, topic, duration_seconds)
+        return None
+
+    def _llm_call_options(self):
+        """Return (stream watcher or None, kwargs for llm_generate).
+
+        The static prompt prefix travels as `cache_prefix` so the provider
+        can reuse its cached prefix; the call's prompt is only the suffix.
+        """
+        options = {'model': self._model_name, 'cache_prefix': _PROMPT_PREFIX}
+        if self.config.llm_json_mode:
+            options['response_schema'] = SCRIPT_RESPONSE_SCHEMA
+        if not self.config.llm_streaming:
+            return None, options
+        watcher = _ScriptStreamWatcher()
+        options.update(stream=True, on_chunk=watcher)
+        return watcher, options
+
+    def _finish_script(
+        self,
+        response_text: str,
+        duration_seconds: int,
+        idea: Dict[str, Any],
+        topic: str,
+        watcher: Optional['_ScriptStreamWatcher'],
+        defer_keywords: bool = False,
+    ) -> Dict[str, Any]:
+        """Parse an LLM response and record it in the script caches."""
+        script_data = self._parse_response(
+            response_text, duration_seconds, idea, topic,
+            stream_watcher=watcher, defer_keywords=defer_keywords,
+        )
+        # Scripts still waiting for keywords are cached by _collect_batch
+        if 'keywords' in script_data:
+            self._store_script(idea, topic, duration_seconds, script_data)
+        return script_data
+
+    @staticmethod
+    def _store_script(
+        idea: Dict[str, Any],
+        topic: str,
+        duration_seconds: int,
+        script_data: Dict[str, Any],
+    ):
+        """Record a freshly generated script in the enabled script caches."""
+        cache = get_script_cache()
+        if cache is not None:
+            cache.store(idea, topic, script_data)
+        templates = get_template_cache()
+        if templates is not None:
+            templates.store(idea, topic, duration_seconds, script_data)
 
-Example minimal `visual_cues` item:
-{{"time_seconds":0, "duration_seconds":3, "type":"text", "content":"⚡ QUICK TECH HACK", "transition":"zoom"}}
+    def _create_prompt(
+        self,
+        idea: Dict[str, Any],
+        topic: str,
+        duration: int,
+    ) -> str:
+        """
+        Create the LLM prompt for viral-style short script generation.
 
-Return only the JSON object. No commentary, no markdown, exact JSON shape requested."""
+        Returns a string prompt configured for the requested duration.
+        """
+        return _PROMPT_PREFIX + self._prompt_suffix(idea, topic, duration)
 
-    def _estimate_word_count(self, duration_seconds: int) -> int:
+    def _prompt_suffix(
+        self,
+        idea: Dict[str, Any],
+        topic: str,
+        duration: int,
+    ) -> str:
+        """Return the per-call part of the prompt that follows `_PROMPT_PREFIX`."""
+        # Estimate words: use slightly faster rate for Shorts
+        estimated = ShortScriptCreator._estimate_word_count(duration)
+
+        return ''.join((
+            # Constant labels stay shared str constants; only the values vary
+            "Input Idea:\nTitle: ", str(idea.get('title')),
+            "\nHook Concept: ", str(idea.get('hook')),
+            "\nCore Value: ", str(idea.get('body')),
+            "\nCTA: ", str(idea.get('cta')),
+            "\nTarget duration_seconds: ", str(duration),
+            "\nTarget estimated_word_count: ", str(estimated),
+            _PROMPT_TAIL,
+        ))
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _estimate_word_count(duration_seconds: int) -> int:
         """Estimate word count for voiceover duration."""
         # Average speech rate: 130-150 words per minute
         # Use 140 WPM as average
@@ -184,6 +478,8 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
         duration_seconds: int,
         idea: Dict[str, Any] = None,
         topic: str = None,
+        stream_watcher: Optional[_ScriptStreamWatcher] = None,
+        defer_keywords: bool = False,
     ) -> Dict[str, Any]:
         """
         Parse Gemini response and extract script data.
@@ -192,28 +488,28 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
             response_text: Raw response from Gemini
             duration_seconds: Target duration
             idea: Original idea dictionary (for topic detection)
+            stream_watcher: Watcher used while streaming; supplies keywords
+                extracted in the background once the script field arrived
+            defer_keywords: Don't extract missing keywords here; the caller
+                fills them in for a whole batch
             
         Returns:
             Parsed script data
         """
         try:
-            # Clean up response and extract JSON
-            json_str = response_text.strip()
-
-            if json_str.startswith('```'):
-                json_str = json_str.split('```')[1]
-                if json_str.startswith('json'):
-                    json_str = json_str[4:]
-                json_str = json_str.strip()
+            # Structured-output responses are bare JSON; only free-form text
+            # needs the optional ``` fence stripped
+            if self.config.llm_json_mode and response_text.lstrip().startswith('{'):
+                json_str = response_text
+            else:
+                m = _FENCE_RE.match(response_text)
+                json_str = m.group(1) if m else response_text.strip()
 
-            script_data = json.loads(json_str)
+            script_data = _json_loads(json_str)
 
             # Post-process script to remove any direct references to code
             # (e.g., "see code below", "I'll show the code", code blocks, etc.)
             try:
-                import re
-                from scripts.code_utils import sanitize_script_for_topic, is_coding_topic, extract_code_markers
-                
                 script_text = script_data.get('script', '')
                 # Prefer explicit topic argument; fall back to idea title
                 resolved_topic = topic or (idea.get('title', '') if (idea and isinstance(idea, dict)) else '')
@@ -232,7 +528,6 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
                     code_snippets.extend(extract_code_markers(visual_cues))
 
                 # Also extract inline code blocks from the script itself (``` blocks or [CODE:...])
-                from scripts.code_utils import extract_code_snippets_from_script
                 inline_snips = extract_code_snippets_from_script(script_text, limit=3)
                 if inline_snips:
                     code_snippets.extend(inline_snips)
@@ -240,7 +535,7 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
                 # Heuristic: pick up short inline code patterns (e.g., "a, b = b, a")
                 if not code_snippets and is_coding:
                     try:
-                        assign_matches = re.findall(r"[A-Za-z0-9_\[\]\(\),\s]+\s*=\s*[^\n\.;]{1,120}", script_text)
+                        assign_matches = _ASSIGN_SNIPPET_RE.findall(script_text)
                         # Clean and limit
                         for m in assign_matches:
                             s = m.strip()
@@ -255,13 +550,12 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
                 # Deduplicate while preserving order
                 seen_cs = set()
                 deduped = []
-                import re as _re
                 for cs in code_snippets:
                     raw = str(cs).strip()
                     if not raw:
                         continue
                     # Try to extract a concise code-like substring (e.g., "a, b = b, a")
-                    m = _re.search(r"[A-Za-z0-9_\[\]\(\),\s]+\s*=\s*[^\n\.;]{1,200}", raw)
+                    m = _ASSIGN_CANDIDATE_RE.search(raw)
                     if m:
                         candidate = m.group(0).strip()
                     else:
@@ -283,10 +577,10 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
                     # Clean up common trailing filler phrases
                     candidate = candidate.strip(" \"'.,;:)")
                     # Remove leading [PAUSE] tokens or common leading words like 'Just', 'Write', 'Use'
-                    candidate = _re.sub(r"^\[PAUSE\]\s*", "", candidate, flags=_re.IGNORECASE)
-                    candidate = _re.sub(r"^(just\s+|write\s+|use\s+|try\s+)", "", candidate, flags=_re.IGNORECASE)
+                    candidate = _LEADING_PAUSE_RE.sub("", candidate)
+                    candidate = _LEADING_FILLER_RE.sub("", candidate)
                     # Remove leading 'in python,' noise
-                    candidate = _re.sub(r"^in\s+python[,:\s]+", "", candidate, flags=_re.IGNORECASE)
+                    candidate = _LEADING_IN_PYTHON_RE.sub("", candidate)
                     for suffix in [' and go', ' and swap', ' and try', ' and use', ' and then', ' then go', ' then try']:
                         if candidate.endswith(suffix):
                             candidate = candidate[: -len(suffix)].strip()
@@ -314,50 +608,65 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
 
             # Provide estimated_word_count if missing
             if not script_data.get('estimated_word_count'):
-                script_data['estimated_word_count'] = self._estimate_word_count(script_data['duration_seconds'])
-
-            # Ensure keywords
-            if not script_data.get('keywords'):
+                script_data['estimated_word_count'] = ShortScriptCreator._estimate_word_count(script_data['duration_seconds'])
+
+            # Ensure keywords (reuse the background extraction from streaming)
+            keywords = (
+                script_data.get('keywords')
+                or (stream_watcher.keywords_for(script_data['script']) if stream_watcher else None)
+            )
+            if keywords:
+                script_data['keywords'] = keywords
+            elif defer_keywords:
+                script_data.pop('keywords', None)
+            else:
                 script_data['keywords'] = extract_keywords(script_data['script'])
 
-            # Normalize visual_cues
+            # Normalize visual_cues: by default the model's cues are trusted and
+            # only missing timings are defaulted. With strict validation they
+            # must carry start times (missing durations come from the gaps).
+            # Otherwise timings are derived from the [PAUSE] split.
             visual_cues = script_data.get('visual_cues') or []
-            if not isinstance(visual_cues, list):
-                visual_cues = []
-
-            # If visual_cues provided but missing timing, derive timings from [PAUSE] split
-            if visual_cues and all(('time_seconds' in v and 'duration_seconds' in v) for v in visual_cues):
-                # keep as-is
+            if self.config.strict_cue_validation:
+                cues_ok = _cues_complete(visual_cues) and _fill_cue_durations(visual_cues, script_data['duration_seconds'])
+            else:
+                cues_ok = _backfill_cues(visual_cues)
+            if cues_ok:
                 script_data['visual_cues'] = visual_cues
             else:
                 # Build cues from narration by splitting on [PAUSE]
-                chunks = [c.strip() for c in script_data['script'].split('[PAUSE]') if c.strip()]
+                chunks, counts = _split_narration(script_data['script'])
                 if not chunks:
-                    chunks = [script_data['script'].strip()]
+                    chunks, counts = [script_data['script'].strip()], [0]
+
+                # Compute durations proportional to word counts (vectorized)
+                words = np.asarray(counts, dtype=np.int32)
+                total_words = int(words.sum()) or 1
+                target = script_data['duration_seconds']
+                durs = np.maximum(0.5, words / total_words * target)
+
+                # Shrink the final cue so the cues fit into the total duration
+                overflow = durs.sum() - target
+                if overflow > 0:
+                    durs[-1] = max(0.5, durs[-1] - overflow)
+
+                starts = np.concatenate(([0.0], np.cumsum(durs[:-1])))
+
+                # Round once for the whole array and hand plain floats to the dicts
+                start_list = np.round(starts, 2).tolist()
+                dur_list = np.round(durs, 2).tolist()
 
-                # Compute durations proportional to word counts
-                words = [len(c.split()) for c in chunks]
-                total_words = sum(words) or 1
                 cues = []
-                current_t = 0.0
                 for i, chunk in enumerate(chunks):
-                    dur = max(0.5, (words[i] / total_words) * script_data['duration_seconds'])
                     cue_type = 'text' if i == 0 else ('b-roll' if i % 2 == 0 else 'image')
                     cues.append({
-                        'time_seconds': round(current_t, 2),
-                        'duration_seconds': round(dur, 2),
+                        'time_seconds': start_list[i],
+                        'duration_seconds': dur_list[i],
                         'type': cue_type,
-                        'content': (chunk[:120]).strip(),
+                        # chunks are already trimmed; only a cut can expose whitespace
+                        'content': chunk if len(chunk) <= 120 else chunk[:120].rstrip(),
                         'transition': 'fade' if i > 0 else 'zoom'
                     })
-                    current_t += dur
-
-                # Normalize final cue durations to fit exactly into total duration
-                if cues:
-                    last = cues[-1]
-                    overflow = current_t - script_data['duration_seconds']
-                    if overflow > 0:
-                        last['duration_seconds'] = max(0.5, last['duration_seconds'] - overflow)
 
                 script_data['visual_cues'] = cues
 
@@ -366,13 +675,6 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
             for v in script_data['visual_cues']:
                 if v.get('type') not in allowed:
                     v['type'] = 'image'
-            # Ensure keywords are present; re-extract if missing or empty
-            if not script_data.get('keywords'):
-                try:
-                    from scripts.utils import extract_keywords
-                    script_data['keywords'] = extract_keywords(script_data.get('script', ''))
-                except Exception:
-                    script_data['keywords'] = []
 
             return script_data
         
@@ -391,30 +693,124 @@ Return only the JSON object. No commentary, no markdown, exact JSON shape reques
         """
         Create scripts for a batch of ideas.
         
+        Runs the asyncio batch when possible. If the caller's thread already
+        runs an event loop (so `asyncio.run` is unavailable), the blocking
+        `create_script` calls are spread over a thread pool instead; the GIL
+        is released while each request waits on the network.
+        
         Args:
             ideas: Dictionary mapping topics to lists of ideas
             
         Returns:
             Dictionary mapping idea IDs to script data
         """
-        all_scripts = {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.acreate_scripts_batch(ideas))
+
+        key_to_ids, unique_payloads = self._group_batch(ideas)
+        llm_warm_up(_PROMPT_PREFIX)
+        keys = list(unique_payloads)
+        results: Dict[str, Any] = {}
+        workers = max(1, self.config.llm_max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scripts') as pool:
+            futures = {
+                pool.submit(self.create_script, idea, topic=topic, defer_keywords=True): key
+                for key, (idea, topic) in unique_payloads.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+        return self._collect_batch(keys, [results[key] for key in keys], key_to_ids, unique_payloads)
+
+    async def acreate_scripts_batch(
+        self,
+        ideas: Dict[str, list],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Create scripts for a batch of ideas concurrently.
+        
+        At most `config.llm_max_concurrency` LLM calls are in flight at once
+        to respect provider rate limits.
         
+        Args:
+            ideas: Dictionary mapping topics to lists of ideas
+            
+        Returns:
+            Dictionary mapping idea IDs to script data (None on failure)
+        """
+        key_to_ids, unique_payloads = self._group_batch(ideas)
+        # Build the shared client once before the concurrent calls start
+        await asyncio.to_thread(llm_warm_up, _PROMPT_PREFIX)
+
+        semaphore = asyncio.Semaphore(max(1, self.config.llm_max_concurrency))
+
+        async def _run(idea: Dict[str, Any], topic: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.acreate_script(idea, topic=topic, defer_keywords=True)
+
+        keys = list(unique_payloads)
+        results = await asyncio.gather(
+            *(_run(*unique_payloads[key]) for key in keys),
+            return_exceptions=True,
+        )
+        return self._collect_batch(keys, results, key_to_ids, unique_payloads)
+
+    @staticmethod
+    def _group_batch(ideas: Dict[str, list]) -> Tuple[Dict[str, list], Dict[str, tuple]]:
+        """Group a batch by idea hash so identical ideas share one LLM call."""
+        # Identical ideas (e.g. after upstream merging/retries) share one LLM call
+        key_to_ids: Dict[str, list] = {}
+        unique_payloads: Dict[str, tuple] = {}
         for topic, topic_ideas in ideas.items():
             print(f"📝 Creating scripts for {len(topic_ideas)} ideas in {topic}")
-            
             for idea in topic_ideas:
                 idea_id = f"{topic}_{idea.get('id')}"
-                
-                try:
-                    script = self.create_script(idea, topic=topic)
-                    all_scripts[idea_id] = script
-                    print(f"✅ Created script for: {idea.get('title')}")
-                except Exception as e:
-                    print(f"⚠️ Failed to create script for {idea.get('title')}: {e}")
-                    all_scripts[idea_id] = None
+                key = idea_hash(idea, topic)
+                key_to_ids.setdefault(key, []).append(idea_id)
+                unique_payloads.setdefault(key, (idea, topic))
+        return key_to_ids, unique_payloads
+
+    def _collect_batch(
+        self,
+        keys: list,
+        results: list,
+        key_to_ids: Dict[str, list],
+        unique_payloads: Dict[str, tuple],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Map per-key results (scripts or exceptions) back to every idea ID."""
+        all_scripts = {}
+
+        # Scripts were generated with defer_keywords: extract the missing
+        # keywords for the whole batch in one call, then cache those scripts
+        pending = [(key, r) for key, r in zip(keys, results) if isinstance(r, dict) and 'keywords' not in r]
+        if pending:
+            texts = [r['script'] for _, r in pending]
+            for (key, script), kws in zip(pending, extract_keywords_batch(texts)):
+                script['keywords'] = kws
+                idea, topic = unique_payloads[key]
+                self._store_script(idea, topic, self.config.video_duration_seconds, script)
+
+        for key, result in zip(keys, results):
+            idea = unique_payloads[key][0]
+            if isinstance(result, BaseException):
+                print(f"⚠️ Failed to create script for {idea.get('title')}: {result}")
+                script = None
+            else:
+                print(f"✅ Created script for: {idea.get('title')}")
+                script = result
+            for n, idea_id in enumerate(key_to_ids[key]):
+                # Duplicates get their own copy so per-video edits don't leak
+                all_scripts[idea_id] = script if n == 0 or script is None else copy.deepcopy(script)
         
         return all_scripts
 
+# Shared instance for the convenience function
+_singleton_creator: Optional[ShortScriptCreator] = None
+
 
 def create_script_from_idea(
     idea: Dict[str, Any],
@@ -430,13 +826,14 @@ def create_script_from_idea(
     Returns:
         Script data
     """
-    creator = ShortScriptCreator()
-    return creator.create_script(idea, topic)
+    global _singleton_creator
+    if _singleton_creator is None:
+        _singleton_creator = ShortScriptCreator()
+    return _singleton_creator.create_script(idea, topic)
 
 
 if __name__ == '__main__':
     # Test script creation
-    import sys
     
     # Example idea (would normally come from IdeaGenerator)
     example_idea = {
@@ -464,7 +861,7 @@ if __name__ == '__main__':
         print(f"Script:\n{script_data['script']}\n")
         print(f"Duration: {script_data.get('duration_seconds', 'N/A')}s")
         print(f"Keywords: {', '.join(script_data.get('keywords', []))}")
-        print(f"Visual Cues: {json.dumps(script_data.get('visual_cues', []), indent=2)}")
+        print(f"Visual Cues: {_json_dumps_pretty(script_data.get('visual_cues', []))}")
     
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -15,10 +15,26 @@ Usage:
 
 import os
 import sys
+import json
 import logging
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: the in-progress marker falls back to O_EXCL creation only
+    fcntl = None
 
 # Fix UTF-8 encoding for Windows terminals
 if sys.platform == 'win32':
@@ -30,13 +46,579 @@ if sys.platform == 'win32':
 
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+__all__ = [
+    'StartupConfig',
+    'refresh_config',
+    'reset_startup_decision_cache',
+    'should_run_startup_verification',
+    'generate_startup_short',
+    'run_startup_verification_if_enabled',
+]
+
+# Set once .env has been loaded in this process (see _ensure_dotenv)
+_dotenv_loaded = False
+
+_TRUTHY = frozenset({'true', '1', 'yes', 'on'})
+
+# Environment variables that make up StartupConfig, in field order
+_STARTUP_ENV_KEYS = (
+    'STARTUP_VERIFICATION',
+    'STARTUP_VERIFICATION_RUN_ONCE',
+    'STARTUP_VERIFICATION_FULL',
+    'STARTUP_VERIFICATION_FAILURE_COOLDOWN_HOURS',
+    'TARGET_TOPIC',
+    'STARTUP_VERIFICATION_TTS_TEXT',
+    'STARTUP_VERIFICATION_FULL_DURATION_SEC',
+    'STARTUP_VERIFICATION_FULL_TEXT',
+    'STARTUP_VERIFICATION_FULL_TITLE',
+    'STARTUP_VERIFICATION_FULL_TIMEOUT_SEC',
+    'CLEANUP_OUTPUT_AFTER_UPLOAD',
+    'STARTUP_VERIFICATION_REDIS_URL',
+    'STARTUP_VERIFICATION_CACHE_AUTH',
+    'STARTUP_VERIFICATION_CACHE_THUMBNAIL',
+)
+
+
+def _ensure_dotenv() -> None:
+    """
+    Load .env on first use rather than at import.
+
+    Loaded once per process tree: child processes inherit the parsed values
+    through os.environ (the _DOTENV_LOADED marker) and skip re-reading it.
+
+    When the process environment explicitly disables verification
+    (STARTUP_VERIFICATION set to a false value) the file is not read at all;
+    set STARTUP_VERIFICATION_SKIP_DOTENV=false to load it anyway. If the
+    variable is unset it may live in .env, so the file is loaded and callers
+    re-check the environment afterwards.
+
+    On Render (RENDER is set) the real environment is already populated,
+    and without a project .env there is nothing to parse, so neither case
+    imports dotenv or searches parent directories for the file. Values
+    already in the environment always win over .env.
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    value = os.environ.get('STARTUP_VERIFICATION')
+    if value is not None and not _truthy(value) and _env_bool('STARTUP_VERIFICATION_SKIP_DOTENV', True):
+        return
+    _dotenv_loaded = True
+    if os.environ.get('_DOTENV_LOADED') or os.environ.get('RENDER'):
+        return
+    env_file = PROJECT_ROOT / '.env'
+    if not env_file.is_file():
+        return
+    from dotenv import load_dotenv
+    load_dotenv(env_file, override=False)
+    os.environ['_DOTENV_LOADED'] = '1'
+
+
+def _truthy(value: Optional[str]) -> bool:
+    """Interpret an environment value as a boolean flag."""
+    return (value or '').lower() in _TRUTHY
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment; unset or empty gives `default`."""
+    value = os.environ.get(name)
+    return value.lower() in _TRUTHY if value else default
+
+
+def _parse_int(value: Optional[str], name: str, default: int) -> int:
+    """
+    Parse an integer setting, falling back to `default` on a malformed value.
+
+    A typo in a setting only the full upload uses must not stop the
+    lightweight verification, so bad values are logged rather than raised.
+    """
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"⚠️ Invalid {name}={value!r}; using {default}")
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class StartupConfig:
+    """Startup verification settings parsed from the environment."""
+    enabled: bool
+    run_once: bool
+    full: bool
+    cooldown_seconds: int
+    topic: str
+    tts_text: str
+    full_duration: int
+    full_text: str
+    full_title: str
+    full_timeout: int
+    cleanup_outputs: bool
+    redis_url: Optional[str]
+    cache_auth: bool
+    cache_thumbnail: bool
+
+    @classmethod
+    def from_env(cls) -> 'StartupConfig':
+        """Return the settings for the current environment.
+
+        Parsing is memoized on the raw values, so repeated calls only cost a
+        few dict lookups while changes to the environment are still picked up.
+        """
+        return _parse_startup_env(tuple(os.environ.get(key) for key in _STARTUP_ENV_KEYS))
+
+
+@lru_cache(maxsize=8)
+def _parse_startup_env(raw: Tuple[Optional[str], ...]) -> StartupConfig:
+    (enabled, run_once, full, cooldown_hours, topic, tts_text,
+     full_duration, full_text, full_title, full_timeout, cleanup, redis_url, cache_auth,
+     cache_thumbnail) = raw
+    return StartupConfig(
+        enabled=_truthy(enabled),
+        run_once=_truthy(run_once),
+        full=_truthy(full),
+        cooldown_seconds=_parse_int(cooldown_hours, 'STARTUP_VERIFICATION_FAILURE_COOLDOWN_HOURS', 6) * 3600,
+        topic=topic if topic is not None else 'startup',
+        tts_text=tts_text if tts_text is not None else 'Render verification test',
+        full_duration=_parse_int(full_duration, 'STARTUP_VERIFICATION_FULL_DURATION_SEC', 6),
+        full_text=full_text if full_text is not None else 'Quick startup verification. [PAUSE]',
+        full_title=full_title if full_title is not None else 'Startup Verification Test',
+        full_timeout=_parse_int(full_timeout, 'STARTUP_VERIFICATION_FULL_TIMEOUT_SEC', 600),
+        cleanup_outputs=_truthy(cleanup if cleanup is not None else 'true'),
+        redis_url=redis_url or None,
+        cache_auth=_truthy(cache_auth),
+        cache_thumbnail=_truthy(cache_thumbnail),
+    )
+
+
+def refresh_config() -> StartupConfig:
+    """Drop the memoized settings and decision (e.g. in tests) and re-read the environment."""
+    _parse_startup_env.cache_clear()
+    reset_startup_decision_cache()
+    return StartupConfig.from_env()
+
+# Where the probes and the full upload write their artifacts
+OUTPUT_DIR = Path('output/shorts')
+TTS_SAMPLE_FILE = OUTPUT_DIR / 'startup_tts_sample.mp3'
+THUMB_CHECK_FILE = OUTPUT_DIR / 'startup_thumbnail_check.png'
+
+# Stored OAuth credentials (same relative path as src.uploader.CREDENTIALS_FILE)
+YOUTUBE_CREDENTIALS_FILE = 'credentials.json'
+
+# How long should_run_startup_verification reuses its marker checks
+DECISION_TTL_SECONDS = 60
+
+# How long a passed YouTube auth check is trusted (STARTUP_VERIFICATION_CACHE_AUTH)
+AUTH_CACHE_TTL_SECONDS = 24 * 3600
+
+# Upper bound on the concurrent lightweight probes
+PROBE_TIMEOUT_SECONDS = 60
+
+# Reuse the authenticated YouTube client within an access token's lifetime (1h)
+SERVICE_TTL_SECONDS = 50 * 60
+
+# Longest wait between retries after repeated verification failures
+FAILURE_COOLDOWN_CAP_SECONDS = 24 * 3600
+
+# Last line of a completely written completion flag
+FLAG_TERMINATOR = 'READY\n'
+
+# Separator around the verification result in the logs
+_BANNER = "=" * 80
+
+# Lightweight probe failure bits and the message for every combination
+PROBE_YOUTUBE, PROBE_THUMB, PROBE_TTS = 1, 2, 4
+_PROBE_ERROR_LABELS = {
+    PROBE_YOUTUBE: 'YouTube auth failed',
+    PROBE_THUMB: 'Thumbnail generation failed',
+    PROBE_TTS: 'TTS generation failed',
+}
+_PROBE_ERROR_TABLE = tuple(
+    '; '.join(label for bit, label in _PROBE_ERROR_LABELS.items() if mask & bit)
+    for mask in range(8)
+)
+
+# Provider errors that mean "try again later" rather than a broken pipeline
+_RATE_LIMIT_RE = re.compile(r'\b(rate[ _-]?limit|429|too[_ ]many[_ ]requests|quota exceeded)\b', re.IGNORECASE)
+
+# Rate-limit exception classes (Groq/OpenAI SDKs, google-api-core)
+_RATE_LIMIT_EXCEPTION_NAMES = frozenset({'RateLimitError', 'ResourceExhausted', 'TooManyRequests'})
+
+# Redis key and lifetime for the optional cross-instance claim
+REDIS_CLAIM_KEY = 'startup_verification:claim'
+REDIS_CLAIM_TTL_SECONDS = 900
+
+# Single-cue SRT for the full startup upload (end second is zero-padded)
+_SRT_TEMPLATE = '1\n00:00:00,000 --> 00:00:{:02d},000\n{}\n\n'
+
+# Filename prefixes of every startup artifact in OUTPUT_DIR (see _prune_startup_outputs)
+STARTUP_OUTPUT_PREFIXES = (
+    'startup_video_',
+    'startup_audio_',
+    'startup_captions_',
+    'startup_thumbnail_',
+    'startup_tts_sample',
+)
+
+# The full upload runs in a child process; it reports back on one stdout line
+FULL_UPLOAD_RESULT_PREFIX = 'STARTUP_VERIFICATION_RESULT='
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=1)
+def _flag_file() -> Path:
+    """Flag file location on persistent disk (Render: /data), resolved on first use."""
+    if os.path.exists('/data'):
+        return Path('/data/.startup_verification_complete')
+    return Path('.startup_verification_complete')
+
+
+@lru_cache(maxsize=1)
+def _inprogress_file() -> Path:
+    """Marker written while a verification is running."""
+    return _flag_file().with_suffix('.inprogress')
+
+
+@lru_cache(maxsize=1)
+def _auth_ok_file() -> Path:
+    """Touched after a live YouTube auth check passes (see _check_youtube)."""
+    return _flag_file().parent / '.yt_auth_ok'
+
+
+@lru_cache(maxsize=1)
+def _thumb_cache_file() -> Path:
+    """Copy of the first startup thumbnail, reused by later lightweight checks."""
+    return _flag_file().parent / '.startup_verification_thumb.png'
+
+
+@lru_cache(maxsize=1)
+def _failed_file() -> Path:
+    """Marker holding the time, consecutive count and reason of the last failure."""
+    return _flag_file().with_suffix('.failed')
+
+
+@lru_cache(maxsize=None)
+def _marker_str(kind: str) -> str:
+    """
+    String form of a marker path: 'flag', 'inprogress' or 'failed'.
+
+    The os.* calls below take these directly, so they skip the __fspath__
+    conversion a Path costs on every call. Path objects stay for mkdir/logs.
+    """
+    return os.fspath({'flag': _flag_file, 'inprogress': _inprogress_file, 'failed': _failed_file}[kind]())
+
+
+def _stat_or_none(path) -> Optional[os.stat_result]:
+    """Stat `path` once, returning None if it does not exist."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+# Descriptor of the in-progress marker while this process holds its lock
+_inprogress_fd: Optional[int] = None
+
+
+def _inprogress_active() -> bool:
+    """
+    True if another verification holds the in-progress marker.
+
+    A marker nobody holds a lock on was left behind by a crashed process and
+    does not count (where flock is available).
+    """
+    path = _marker_str('inprogress')
+    if _stat_or_none(path) is None:
+        return False
+    if fcntl is None:
+        return True
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+def _acquire_inprogress_lock() -> bool:
+    """
+    Atomically claim the in-progress marker.
+
+    The marker is created with O_CREAT|O_EXCL, so concurrent boots cannot
+    both claim it, and (on POSIX) an exclusive flock is held on it until
+    `_release_inprogress_lock`. A marker left by a crashed process carries no
+    lock and is taken over.
+
+    Returns:
+        bool: False if another process is already running verification
+    """
+    global _inprogress_fd
+    path = _marker_str('inprogress')
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        if fcntl is None:
+            return False
+        try:
+            fd = os.open(path, os.O_WRONLY)
+        except FileNotFoundError:
+            # The owner just finished
+            return False
+    except OSError as e:
+        # Read-only disk etc.: run without a marker rather than not at all
+        logger.warning(f"⚠️ Could not write startup in-progress marker; continuing anyway: {e}")
+        return True
+
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # The previous owner may have unlinked the file before we locked it
+            if os.fstat(fd).st_ino != os.stat(path).st_ino:
+                raise OSError("in-progress marker was replaced")
+        except OSError:
+            os.close(fd)
+            return False
+
+    os.ftruncate(fd, 0)
+    os.write(fd, f"pid={os.getpid()} started={datetime.now().isoformat()}\n".encode('utf-8'))
+    _inprogress_fd = fd
+    return True
+
 
-# Flag file location on persistent disk (Render: /data)
-STARTUP_FLAG_FILE = Path('/data/.startup_verification_complete') if os.path.exists('/data') else Path('.startup_verification_complete')
-STARTUP_INPROGRESS_FILE = STARTUP_FLAG_FILE.with_suffix('.inprogress')
-STARTUP_FAILED_FILE = STARTUP_FLAG_FILE.with_suffix('.failed')
+def _release_inprogress_lock() -> None:
+    """Remove the in-progress marker and drop its lock (no-op if not held)."""
+    global _inprogress_fd
+    if _inprogress_fd is None:
+        # Never created (read-only disk) or already promoted to the flag
+        return
+    with suppress(OSError):
+        os.unlink(_marker_str('inprogress'))
+    os.close(_inprogress_fd)
+    _inprogress_fd = None
+
+
+def _promote_inprogress_to_flag(body: str) -> None:
+    """
+    Turn the held in-progress marker into the completion flag.
+
+    The flag body goes into the marker through its open descriptor and the
+    file is renamed onto the flag path, so "write flag" and "remove marker"
+    are one atomic rename. Falls back to `_atomic_write_flag` when this
+    process has no marker descriptor, and on Windows (no fcntl), where an
+    open file can't be renamed.
+    """
+    global _inprogress_fd
+    fd = _inprogress_fd
+    if fd is None or fcntl is None:
+        _atomic_write_flag(_flag_file(), body)
+        return
+    os.ftruncate(fd, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+    os.write(fd, (body + FLAG_TERMINATOR).encode('utf-8'))
+    # The flag must survive a crash; the other markers are not fsynced
+    os.fsync(fd)
+    os.replace(_marker_str('inprogress'), _marker_str('flag'))
+    os.close(fd)
+    _inprogress_fd = None
+
+
+@contextmanager
+def _inprogress_marker():
+    """
+    Hold the in-progress marker for the duration of the block.
+
+    Yields whether the marker was claimed; when it was, it is released on
+    every exit path, including exceptions.
+    """
+    claimed = _acquire_inprogress_lock()
+    try:
+        yield claimed
+    finally:
+        if claimed:
+            _release_inprogress_lock()
+
+
+@lru_cache(maxsize=2)
+def _redis_client(url: str):
+    """Return a Redis client for `url` (redis is imported only when configured)."""
+    import redis
+    return redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5)
+
+
+def _try_distributed_claim() -> bool:
+    """
+    Claim startup verification across instances via Redis SET NX EX.
+
+    Only active when STARTUP_VERIFICATION_REDIS_URL is set; the key lives
+    for REDIS_CLAIM_TTL_SECONDS so a crashed holder can't block forever.
+    If Redis is unavailable the claim is treated as granted: the local
+    marker still applies and verification is better run twice than never.
+
+    Returns:
+        bool: False only when another instance holds the claim
+    """
+    url = StartupConfig.from_env().redis_url
+    if not url:
+        return True
+    try:
+        claimed = _redis_client(url).set(REDIS_CLAIM_KEY, os.getpid(), nx=True, ex=REDIS_CLAIM_TTL_SECONDS)
+        return bool(claimed)
+    except Exception as e:
+        logger.warning(f"⚠️ Redis claim unavailable, continuing with the local marker only: {e}")
+        return True
+
+
+def _release_distributed_claim() -> None:
+    """Delete the Redis claim key after a successful verification."""
+    url = StartupConfig.from_env().redis_url
+    if not url:
+        return
+    try:
+        _redis_client(url).delete(REDIS_CLAIM_KEY)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not release Redis claim: {e}")
+
+
+def _write_small(path, body: str, fsync: bool = True) -> None:
+    """
+    Write a short UTF-8 payload with one open/write(/fsync)/close.
+
+    Skips the text-mode wrapper and locale lookup of Path.write_text; pass
+    fsync=False for files that don't need to survive a crash.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, body.encode('utf-8'))
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_flag(path: Path, body: str) -> None:
+    """
+    Write the completion flag so readers never see a torn file.
+
+    The body plus a `READY` terminator line goes to a temp sibling, is
+    fsynced, then renamed over `path` (rename is atomic on one filesystem).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    target = os.fspath(path)
+    tmp = target + '.tmp'
+    _write_small(tmp, body + FLAG_TERMINATOR)
+    os.replace(tmp, target)
+
+
+def _is_flag_valid(path: str) -> bool:
+    """
+    True if the completion flag exists and was written completely.
+
+    A flag without the `READY` terminator is a leftover from a crash
+    mid-write; it is removed and treated as absent. Flags written before the
+    terminator existed (two complete "Verification completed" lines) are
+    still accepted.
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read(4096)
+    except OSError:
+        return False
+    if content.endswith(FLAG_TERMINATOR.encode()):
+        return True
+    if content.startswith(b'Verification completed at ') and content.count(b'\n') >= 2:
+        return True
+    logger.warning(f"⚠️ Ignoring incomplete completion flag {path}")
+    with suppress(OSError):
+        os.unlink(path)
+    return False
+
+
+def _read_failed_marker() -> Optional[Tuple[int, int]]:
+    """
+    Read the failed marker: `{retry-after epoch}\n{failure count}\n{reason}\n`.
+
+    The cooldown is resolved when the marker is written, so checking it is an
+    integer compare. Markers from before that (an ISO failure time first)
+    are converted using the current cooldown setting.
+
+    Returns:
+        (epoch seconds when a retry is allowed, consecutive failures), or
+        None if there is no readable marker. Markers without a count count as 1.
+    """
+    # Open directly instead of exists() + read: one syscall, no TOCTOU gap
+    try:
+        with open(_marker_str('failed'), 'rb') as f:
+            first_line, _, rest = f.read(4096).partition(b'\n')
+    except OSError:
+        return None
+    second_line = rest.partition(b'\n')[0].strip()
+    count = max(int(second_line), 1) if second_line.isdigit() else 1
+    first_line = first_line.strip()
+    if first_line.isdigit():
+        return int(first_line), count
+    try:
+        failed_time = datetime.fromisoformat(first_line.decode('ascii'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    cooldown = _failure_cooldown_seconds(StartupConfig.from_env().cooldown_seconds, count)
+    return int(failed_time.timestamp() + cooldown), count
+
+
+def _failure_cooldown_seconds(base_seconds: int, count: int) -> float:
+    """Exponential backoff: base * 2**(count-1), capped at 24h (or the base, if larger)."""
+    cap = max(base_seconds, FAILURE_COOLDOWN_CAP_SECONDS)
+    return min(base_seconds * 2 ** min(count - 1, 16), cap)
+
+
+def _write_failed_marker(reason: str, transient: bool = False) -> None:
+    """
+    Record a failed verification, incrementing the consecutive-failure count.
+
+    Args:
+        reason: Short description stored in the marker
+        transient: Keep the current count (e.g. probe timeouts) so the next
+            cooldown is not doubled
+    """
+    previous = _read_failed_marker()
+    if previous is None:
+        count = 1
+    else:
+        count = previous[1] if transient else previous[1] + 1
+    cooldown = _failure_cooldown_seconds(StartupConfig.from_env().cooldown_seconds, count)
+    retry_after = int(time.time() + cooldown)
+    _failed_file().parent.mkdir(parents=True, exist_ok=True)
+    _write_small(_marker_str('failed'), f"{retry_after}\n{count}\n{reason}\n", fsync=False)
+
+
+def _clear_failed_marker() -> None:
+    """Forget earlier failures once a verification succeeds."""
+    with suppress(OSError):
+        os.unlink(_marker_str('failed'))
+
+
+def _present_markers() -> frozenset:
+    """
+    Which markers ('flag', 'failed', 'inprogress') currently exist.
+
+    One scandir of the marker directory replaces a stat/open per marker; on
+    the usual boot none exist and nothing else touches the disk. If the
+    directory can't be listed, every marker is reported so the callers fall
+    back to checking each file directly.
+    """
+    names = {os.path.basename(_marker_str(kind)): kind for kind in ('flag', 'failed', 'inprogress')}
+    try:
+        with os.scandir(_flag_file().parent) as it:
+            return frozenset(names[entry.name] for entry in it if entry.name in names)
+    except FileNotFoundError:
+        return frozenset()
+    except OSError:
+        return frozenset(names.values())
 
 
 def should_run_startup_verification() -> bool:
@@ -47,66 +629,343 @@ def should_run_startup_verification() -> bool:
     - If STARTUP_VERIFICATION_RUN_ONCE=true, also checks if it already ran
     - Returns False if flag file exists and run_once is enabled
     """
-    startup_verify = os.getenv('STARTUP_VERIFICATION', 'false').lower()
-    if startup_verify not in ('true', '1', 'yes', 'on'):
+    _ensure_dotenv()
+    if not _env_bool('STARTUP_VERIFICATION'):
         return False
-    
+    return _should_run_decision(StartupConfig.from_env(), int(time.monotonic() // DECISION_TTL_SECONDS))
+
+
+@lru_cache(maxsize=4)
+def _should_run_decision(cfg: StartupConfig, ttl_bucket: int) -> bool:
+    """
+    The marker checks behind should_run_startup_verification.
+
+    Memoized per settings snapshot and TTL window, so repeated calls (health
+    checks, re-entrant init) don't re-stat the markers. Cleared whenever this
+    process finishes a verification, since that changes the markers.
+    """
     # Check run-once mode
-    run_once = os.getenv('STARTUP_VERIFICATION_RUN_ONCE', 'false').lower() in ('true', '1', 'yes')
-    
-    if run_once:
-        if STARTUP_FLAG_FILE.exists():
+    if cfg.run_once:
+        present = _present_markers()
+        if 'flag' in present and _is_flag_valid(_marker_str('flag')):
             logger.info("⏭️  Startup verification already completed on previous boot (STARTUP_VERIFICATION_RUN_ONCE=true)")
             return False
-        # If verification previously failed, respect cooldown to avoid repeated failures
-        cooldown_hours = int(os.getenv('STARTUP_VERIFICATION_FAILURE_COOLDOWN_HOURS', '6'))
-        if STARTUP_FAILED_FILE.exists():
-            try:
-                content = STARTUP_FAILED_FILE.read_text()
-                # first line expected to be ISO timestamp
-                first_line = content.splitlines()[0].strip()
-                failed_time = datetime.fromisoformat(first_line)
-                delta = datetime.now() - failed_time
-                if delta.total_seconds() < cooldown_hours * 3600:
-                    logger.info(f"⏭️  Previous startup verification failed {delta}, within cooldown ({cooldown_hours}h). Skipping new attempt.")
-                    return False
-                else:
-                    logger.info("🔁 Previous startup verification failed but cooldown expired; will attempt again.")
-            except Exception:
-                # If parsing fails, fall through and allow attempt
-                pass
+        # If verification previously failed, back off before trying again:
+        # the cooldown doubles with each consecutive failure (capped at 24h)
+        failure = _read_failed_marker() if 'failed' in present else None
+        if failure is not None:
+            retry_after, count = failure
+            remaining = retry_after - time.time()
+            if remaining > 0:
+                logger.info(f"⏭️  Previous startup verification failed ({count} in a row); within cooldown for another {remaining / 3600:.1f}h. Skipping new attempt.")
+                return False
+            else:
+                logger.info("🔁 Previous startup verification failed but cooldown expired; will attempt again.")
         # If an in-progress marker exists, avoid starting another concurrent verification
-        if STARTUP_INPROGRESS_FILE.exists():
+        if 'inprogress' in present and _inprogress_active():
             logger.info("⏳ Startup verification already in progress (in-progress marker found). Skipping this trigger.")
             return False
     
     return True
 
 
+def reset_startup_decision_cache() -> None:
+    """Forget the memoized should-run decision, e.g. after changing the markers."""
+    _should_run_decision.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _cached_youtube_service(token_mtime: Optional[float], ttl_bucket: int):
+    """Build the YouTube client; cached per credentials-file version and TTL window."""
+    from src.uploader import get_authenticated_service
+    return get_authenticated_service()
+
+
+def _youtube_service():
+    """
+    Return an authenticated YouTube client, reusing the previous one when the
+    stored credentials are unchanged and it is younger than the TTL window.
+
+    Skips the credentials read, token refresh and discovery-document fetch
+    on repeated verifications in one process.
+    """
+    from src.uploader import CREDENTIALS_FILE
+    st = _stat_or_none(CREDENTIALS_FILE)
+    return _cached_youtube_service(st.st_mtime if st else None, int(time.time() // SERVICE_TTL_SECONDS))
+
+
+def _auth_check_fresh() -> bool:
+    """
+    True if a live auth check passed within AUTH_CACHE_TTL_SECONDS and the
+    stored credentials haven't been replaced since.
+    """
+    st = _stat_or_none(_auth_ok_file())
+    if st is None or time.time() - st.st_mtime >= AUTH_CACHE_TTL_SECONDS:
+        return False
+    creds = _stat_or_none(YOUTUBE_CREDENTIALS_FILE)
+    return creds is None or creds.st_mtime <= st.st_mtime
+
+
+def _check_youtube() -> Tuple[bool, str]:
+    """
+    Verify YouTube credentials with a channels.list call.
+
+    With STARTUP_VERIFICATION_CACHE_AUTH=true a pass within the last 24h
+    (recorded next to the completion flag) stands in for the network call.
+    """
+    cache_auth = StartupConfig.from_env().cache_auth
+    if cache_auth and _auth_check_fresh():
+        logger.info("✅ YouTube credentials verified recently (cached auth check)")
+        return True, 'cached'
+    try:
+        svc = _youtube_service()
+        # Request channel list to verify credentials
+        channels = svc.channels().list(part='id', mine=True).execute()
+        if channels and channels.get('items') is not None:
+            logger.info("✅ YouTube credentials verified (channels.list succeeded)")
+            if cache_auth:
+                with suppress(OSError):
+                    _auth_ok_file().touch()
+            return True, 'channels.list succeeded'
+        return False, 'channels.list returned no items'
+    except Exception as e:
+        logger.warning(f"⚠️ YouTube credential check failed: {e}")
+        return False, str(e)
+
+
+def _check_thumbnail() -> Tuple[bool, str]:
+    """
+    Generate a tiny thumbnail to verify the visuals pipeline.
+
+    Renders live by default. With STARTUP_VERIFICATION_CACHE_THUMBNAIL=true
+    the first render is kept next to the completion flag and later boots
+    reuse it instead of loading fonts and compositing again; that only
+    proves an earlier render worked, so font/PIL/Pexels breakage after the
+    first boot goes unnoticed.
+    """
+    cache_thumbnail = StartupConfig.from_env().cache_thumbnail
+    cached = _thumb_cache_file()
+    if cache_thumbnail and _stat_or_none(cached) is not None:
+        logger.info(f"✅ Thumbnail OK (cached earlier render, not a live check): {cached}")
+        return True, str(cached)
+    try:
+        thumb_path = _render_startup_thumbnail('Startup Verification Test', THUMB_CHECK_FILE)
+        if thumb_path:
+            logger.info(f"✅ Thumbnail generation OK: {thumb_path}")
+            if cache_thumbnail:
+                try:
+                    shutil.copyfile(thumb_path, cached)
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not cache startup thumbnail: {e}")
+            return True, str(thumb_path)
+        return False, 'no thumbnail produced'
+    except Exception as e:
+        logger.warning(f"⚠️ Thumbnail generation failed: {e}")
+        return False, str(e)
+
+
+def _render_startup_thumbnail(title: str, dest: Path) -> Optional[Path]:
+    """
+    Render a thumbnail to `dest`.
+
+    generate_visuals always names its file thumbnail.png, so render into a
+    private temp dir and move it, leaving other writers' thumbnails alone.
+    """
+    from scripts.thumbnail_generator import generate_shorts_thumbnail
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=dest.parent, prefix='.startup_thumb_') as tmp:
+        rendered = generate_shorts_thumbnail(title, Path(tmp))
+        if not rendered:
+            return None
+        os.replace(rendered, dest)
+    return dest
+
+
+def _check_tts(sample_text: str) -> Tuple[bool, str]:
+    """Generate a short TTS sample to validate the TTS provider."""
+    try:
+        from scripts.tts_generator import TTSGenerator
+        # A cache hit would pass without reaching the provider
+        tts = TTSGenerator(use_cache=False)
+        audio_path = tts.generate_speech(sample_text, TTS_SAMPLE_FILE)
+        if audio_path and audio_path.exists():
+            logger.info(f"✅ TTS sample generated: {audio_path}")
+            return True, str(audio_path)
+        return False, 'no audio produced'
+    except Exception as e:
+        logger.warning(f"⚠️ TTS sample generation failed: {e}")
+        return False, str(e)
+
+
+def _is_rate_limit_error(e: BaseException) -> bool:
+    """
+    True if `e` is a provider rate-limit / quota error.
+
+    Checks the status the client libraries attach (googleapiclient HttpError
+    `resp.status`, Groq/OpenAI-style `status_code`) and their rate-limit
+    exception class names without importing them; only exceptions that carry
+    neither fall back to matching the message.
+    """
+    status = getattr(e, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(e, 'resp', None), 'status', None)
+    if status is not None:
+        with suppress(TypeError, ValueError):
+            return int(status) == 429
+    if type(e).__name__ in _RATE_LIMIT_EXCEPTION_NAMES:
+        return True
+    return _RATE_LIMIT_RE.search(str(e)) is not None
+
+
+def _youtube_credentials_present() -> bool:
+    """
+    Cheap check that get_authenticated_service has something to work with.
+
+    Mirrors its sources (src.uploader.CREDENTIALS_FILE, or the env refresh
+    token trio) without importing the Google client libraries.
+    """
+    if all(os.environ.get(key) for key in ('YOUTUBE_REFRESH_TOKEN', 'YOUTUBE_CLIENT_ID', 'YOUTUBE_CLIENT_SECRET')):
+        return True
+    return _stat_or_none(YOUTUBE_CREDENTIALS_FILE) is not None
+
+
+def _run_probes(probes: dict) -> dict:
+    """
+    Run the probe callables concurrently with a shared deadline.
+
+    Returns:
+        dict: name -> (ok, detail); probes still running at the deadline
+        report (False, 'timeout')
+    """
+    results = dict.fromkeys(probes, (False, 'timeout'))
+    # Not a `with` block: leaving one joins the workers, so a stalled
+    # Google API call would still hold up boot past the deadline
+    pool = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix='startup-probe')
+    futures = {pool.submit(fn): name for name, fn in probes.items()}
+    try:
+        for future in as_completed(futures, timeout=PROBE_TIMEOUT_SECONDS):
+            results[futures[future]] = future.result()
+    except FuturesTimeoutError:
+        stalled = sorted(name for future, name in futures.items() if not future.done())
+        logger.warning(f"⚠️ Startup probes did not finish within {PROBE_TIMEOUT_SECONDS}s: {', '.join(stalled)}")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
 def generate_startup_short() -> dict:
     """
-    Generate a test short on startup to verify the system is working.
-    
-    This function:
-    1. Generates one viral idea
-    2. Creates script
-    3. Generates TTS
-    4. Creates video
-    5. Uploads to YouTube
-    6. Cleans up outputs
-    
+    Verify on startup that the system is working.
+
+    Runs the lightweight probes (YouTube auth, thumbnail, TTS sample), or a
+    minimal full upload when STARTUP_VERIFICATION_FULL is set, while holding
+    the in-progress marker.
+
     Returns:
         dict: Result with 'status', 'video_id', 'timestamp', 'message'
     """
-    logger.info("=" * 80)
-    logger.info("🔍 STARTUP VERIFICATION: Generating test short...")
-    logger.info("=" * 80)
+    logger.info("%s\n🔍 STARTUP VERIFICATION: Generating test short...\n%s", _BANNER, _BANNER)
     
+    _ensure_dotenv()
+    # One clock read for the whole run; the result timestamps all share it
+    t0 = datetime.now()
+    stamp = t0.strftime("%Y%m%d_%H%M%S")
+
+    try:
+        # Claim the in-progress marker atomically so concurrent boots can't both
+        # run; it is removed again however verification ends
+        with _inprogress_marker() as claimed:
+            if not claimed:
+                logger.info("⏳ Another worker is already running startup verification. Skipping.")
+                return {
+                    'status': 'skipped',
+                    'message': 'Startup verification skipped: another worker is running it',
+                    'timestamp': stamp
+                }
+            # Cluster-wide claim for deploys whose workers don't share a disk
+            if not _try_distributed_claim():
+                logger.info("⏳ Startup verification already claimed by another instance (Redis). Skipping.")
+                return {
+                    'status': 'skipped',
+                    'message': 'Startup verification skipped: claimed by another instance',
+                    'timestamp': stamp
+                }
+            result = _run_startup_checks(t0)
+            # On failure the key is left to expire so other instances back off too
+            if result.get('status') in ('success', 'verified'):
+                _release_distributed_claim()
+            return result
+    finally:
+        # The markers may have changed; decide afresh next time
+        reset_startup_decision_cache()
+
+
+def _lightweight_passed(cfg: StartupConfig, t0: datetime, stamp: str) -> dict:
+    """Record a passed lightweight verification and build its result."""
+    logger.info("\n%s\n✅ STARTUP VERIFICATION PASSED (lightweight)\n%s", _BANNER, _BANNER)
+    _clear_failed_marker()
+    # Write flag file if run_once is enabled
+    if cfg.run_once:
+        try:
+            _promote_inprogress_to_flag(f"Verification completed at {t0.isoformat()}\nLightweight verification passed\n")
+            logger.info(f"💾 Saved completion flag to {_flag_file()}")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not write flag file: {e}")
+    return {
+        'status': 'verified',
+        'message': 'Lightweight startup verification succeeded',
+        'timestamp': stamp
+    }
+
+
+def _lightweight_failed(results: dict, stamp: str) -> dict:
+    """Record a failed lightweight verification and build its result."""
+    youtube_ok, thumb_ok, tts_ok = (results[name][0] for name in ('youtube', 'thumb', 'tts'))
+    timed_out = {name for name, result in results.items() if result == (False, 'timeout')}
+    mask = (0 if youtube_ok else PROBE_YOUTUBE) | (0 if thumb_ok else PROBE_THUMB) | (0 if tts_ok else PROBE_TTS)
+    combined = _PROBE_ERROR_TABLE[mask] or 'Unknown failure'
+    if timed_out:
+        combined += f" (timed out: {', '.join(sorted(timed_out))})"
+
+    logger.error(
+        "\n%s\n❌ STARTUP VERIFICATION FAILED (lightweight)\n%s\nError: %s\n"
+        "\n⚠️  System startup completed but verification failed.\nCheck logs above for details.\n%s",
+        _BANNER, _BANNER, combined, _BANNER,
+    )
+
+    # Write failed marker; a failure caused only by stalled probes is
+    # transient and does not lengthen the backoff
+    transient = bool(timed_out) and all(
+        name in timed_out for name, (ok, _) in results.items() if not ok
+    )
+    try:
+        _write_failed_marker(combined, transient=transient)
+        logger.info(f"💾 Written failure marker to {_failed_file()}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not write failure marker: {e}")
+
+    return {
+        'status': 'failed',
+        'message': f'Startup verification failed: {combined}',
+        'failure_mask': mask,
+        'timestamp': stamp
+    }
+
+
+def _run_startup_checks(t0: datetime) -> dict:
+    """
+    Run the full or lightweight verification; the caller holds the marker.
+
+    Args:
+        t0: Start of the verification run, reused for flag and result timestamps
+    """
+    stamp = t0.strftime("%Y%m%d_%H%M%S")
     # If full startup upload is explicitly requested, run the full (but minimal) upload.
-    if os.getenv('STARTUP_VERIFICATION_FULL', 'false').lower() in ('true', '1', 'yes'):
+    cfg = StartupConfig.from_env()
+    if cfg.full:
         try:
             logger.info("🔔 STARTUP_VERIFICATION_FULL=true: running full minimal upload test")
-            return _perform_full_startup_upload()
+            return _run_full_startup_upload_subprocess()
         except Exception as e:
             logger.warning(f"⚠️ Full startup upload failed, falling back to lightweight checks: {e}")
 
@@ -117,167 +976,57 @@ def generate_startup_short() -> dict:
         # 3) Generate a short TTS sample (one-line) to validate TTS provider
         # This avoids heavy MoviePy video assembly during startup while still
         # validating that the service can post to YouTube.
-        
-        # Create in-progress marker to prevent duplicates
-        try:
-            STARTUP_INPROGRESS_FILE.write_text(f"started:{datetime.now().isoformat()}\n")
-        except Exception:
-            logger.warning("⚠️ Could not write startup in-progress marker; continuing anyway")
-
-        # 1) Verify YouTube credentials
-        youtube_ok = False
-        try:
-            from src.uploader import get_authenticated_service
-            svc = get_authenticated_service()
-            # Request channel list to verify credentials
-            channels = svc.channels().list(part='id', mine=True).execute()
-            if channels and channels.get('items') is not None:
-                youtube_ok = True
-                logger.info("✅ YouTube credentials verified (channels.list succeeded)")
-        except Exception as e:
-            logger.warning(f"⚠️ YouTube credential check failed: {e}")
-
-        # 2) Generate a tiny thumbnail to verify visuals pipeline
-        thumb_ok = False
-        try:
-            from scripts.thumbnail_generator import generate_shorts_thumbnail
-            from pathlib import Path
-            out_dir = Path('output/shorts')
-            thumb_path = generate_shorts_thumbnail('Startup Verification Test', out_dir)
-            if thumb_path:
-                thumb_ok = True
-                logger.info(f"✅ Thumbnail generation OK: {thumb_path}")
-        except Exception as e:
-            logger.warning(f"⚠️ Thumbnail generation failed: {e}")
-
-        # 3) Generate a short TTS sample
-        tts_ok = False
-        try:
-            from scripts.tts_generator import TTSGenerator
-            from pathlib import Path
-            tts = TTSGenerator()
-            sample_text = os.getenv('STARTUP_VERIFICATION_TTS_TEXT', 'Render verification test')
-            sample_out = Path('output/shorts/startup_tts_sample.mp3')
-            audio_path = tts.generate_speech(sample_text, sample_out)
-            if audio_path and audio_path.exists():
-                tts_ok = True
-                logger.info(f"✅ TTS sample generated: {audio_path}")
-        except Exception as e:
-            logger.warning(f"⚠️ TTS sample generation failed: {e}")
-
-        # Decide outcome
-        if youtube_ok and (thumb_ok or tts_ok):
-            logger.info("\n" + "=" * 80)
-            logger.info("✅ STARTUP VERIFICATION PASSED (lightweight)")
-            logger.info("=" * 80)
-            # Write flag file if run_once is enabled
-            if os.getenv('STARTUP_VERIFICATION_RUN_ONCE', 'false').lower() in ('true', '1', 'yes'):
-                try:
-                    STARTUP_FLAG_FILE.parent.mkdir(parents=True, exist_ok=True)
-                    STARTUP_FLAG_FILE.write_text(f"Verification completed at {datetime.now().isoformat()}\nLightweight verification passed\n")
-                    logger.info(f"💾 Saved completion flag to {STARTUP_FLAG_FILE}")
-                except Exception as e:
-                    logger.warning(f"⚠️  Could not write flag file: {e}")
-
-            # Remove in-progress marker
-            try:
-                if STARTUP_INPROGRESS_FILE.exists():
-                    STARTUP_INPROGRESS_FILE.unlink()
-            except Exception:
-                pass
 
-            return {
-                'status': 'verified',
-                'message': 'Lightweight startup verification succeeded',
-                'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S")
-            }
+        if _youtube_credentials_present():
+            # The three probes are independent and I/O-bound, so run them together
+            results = _run_probes({
+                'youtube': _check_youtube,
+                'thumb': _check_thumbnail,
+                'tts': partial(_check_tts, cfg.tts_text),
+            })
         else:
-            error_msg = []
-            if not youtube_ok:
-                error_msg.append('YouTube auth failed')
-            if not thumb_ok:
-                error_msg.append('Thumbnail generation failed')
-            if not tts_ok:
-                error_msg.append('TTS generation failed')
-            combined = '; '.join(error_msg) if error_msg else 'Unknown failure'
-
-            logger.error("\n" + "=" * 80)
-            logger.error("❌ STARTUP VERIFICATION FAILED (lightweight)")
-            logger.error("=" * 80)
-            logger.error(f"Error: {combined}")
-            logger.error("\n⚠️  System startup completed but verification failed.")
-            logger.error("Check logs above for details.")
-            logger.error("=" * 80)
-
-            # Remove in-progress marker on failure
-            try:
-                if STARTUP_INPROGRESS_FILE.exists():
-                    STARTUP_INPROGRESS_FILE.unlink()
-            except Exception:
-                pass
-
-            # Write failed marker
-            try:
-                STARTUP_FAILED_FILE.parent.mkdir(parents=True, exist_ok=True)
-                STARTUP_FAILED_FILE.write_text(f"{datetime.now().isoformat()}\n{combined}\n")
-                logger.info(f"💾 Written failure marker to {STARTUP_FAILED_FILE}")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not write failure marker: {e}")
-
-            return {
-                'status': 'failed',
-                'message': f'Startup verification failed: {combined}',
-                'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Verification can't pass without YouTube auth, so don't pay for
+            # the uploader/TTS/visuals imports just to report that
+            logger.warning("⚠️ No YouTube credentials (credentials.json or YOUTUBE_REFRESH_TOKEN/CLIENT_ID/CLIENT_SECRET); skipping thumbnail and TTS probes")
+            results = {
+                'youtube': (False, 'no YouTube credentials'),
+                'thumb': (True, 'skipped'),
+                'tts': (True, 'skipped'),
             }
-            
+        ok = results['youtube'][0] and (results['thumb'][0] or results['tts'][0])
+        if not ok:
+            return _lightweight_failed(results, stamp)
+        return _lightweight_passed(cfg, t0, stamp)
+
     except Exception as e:
-        error_str = str(e).lower()
-        
         # Check for rate limit errors - these are transient, not system failures
-        if 'rate limit' in error_str or '429' in error_str:
-            logger.warning("\n" + "=" * 80)
-            logger.warning("⚠️  STARTUP VERIFICATION SKIPPED: API Rate Limit Hit")
-            logger.warning("=" * 80)
-            logger.warning(f"Groq/LLM provider rate limit reached: {e}")
-            logger.warning("This is normal after many generations. Token limit resets daily.")
-            logger.warning("System will continue with scheduler. Next run will try again tomorrow.")
-            logger.warning("=" * 80)
-            
-            # Clean up in-progress marker
-            try:
-                if STARTUP_INPROGRESS_FILE.exists():
-                    STARTUP_INPROGRESS_FILE.unlink()
-            except Exception:
-                pass
+        if _is_rate_limit_error(e):
+            logger.warning(
+                "\n%s\n⚠️  STARTUP VERIFICATION SKIPPED: API Rate Limit Hit\n%s\n"
+                "Groq/LLM provider rate limit reached: %s\n"
+                "This is normal after many generations. Token limit resets daily.\n"
+                "System will continue with scheduler. Next run will try again tomorrow.\n%s",
+                _BANNER, _BANNER, e, _BANNER,
+            )
             
             # Don't write failure marker for rate limits - let it retry tomorrow
             return {
                 'status': 'skipped',
                 'message': 'Startup verification skipped: API rate limit (will retry tomorrow)',
-                'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S")
+                'timestamp': stamp
             }
         
         # For other exceptions, log and mark as failed
-        logger.error("\n" + "=" * 80)
-        logger.error("❌ STARTUP VERIFICATION ERROR")
-        logger.error("=" * 80)
-        logger.error(f"Exception: {str(e)}")
-        logger.error("Traceback:", exc_info=True)
-        logger.error("\nThe system may still function, but verification failed.")
-        logger.error("=" * 80)
+        logger.error(
+            "\n%s\n❌ STARTUP VERIFICATION ERROR\n%s\nException: %s\n"
+            "\nThe system may still function, but verification failed.\n%s\nTraceback:",
+            _BANNER, _BANNER, e, _BANNER, exc_info=True,
+        )
         
-        # Ensure in-progress marker removed on unexpected exception
-        try:
-            if STARTUP_INPROGRESS_FILE.exists():
-                STARTUP_INPROGRESS_FILE.unlink()
-        except Exception:
-            pass
-
         # Write failure marker on unexpected exception to prevent tight restart loops
         try:
-            STARTUP_FAILED_FILE.parent.mkdir(parents=True, exist_ok=True)
-            STARTUP_FAILED_FILE.write_text(f"{datetime.now().isoformat()}\nException: {str(e)[:200]}\n")
-            logger.info(f"💾 Written failure marker to {STARTUP_FAILED_FILE} due to exception")
+            _write_failed_marker(f"Exception: {str(e)[:200]}")
+            logger.info(f"💾 Written failure marker to {_failed_file()} due to exception")
         except Exception:
             pass
 
@@ -288,148 +1037,222 @@ def generate_startup_short() -> dict:
         }
 
 
-    def _perform_full_startup_upload() -> dict:
-        """Perform a minimal full upload on startup.
+@lru_cache(maxsize=4)
+def _caption_text(script_text: str) -> str:
+    """Strip pause markers from the startup script for the single SRT cue."""
+    return script_text.replace('[PAUSE]', '').strip()
 
-        This builds a very short (configurable) video, uploads it to YouTube, and
-        writes the success flag so it won't run again if `STARTUP_VERIFICATION_RUN_ONCE`
-        is enabled. The video is intentionally minimal to reduce runtime and memory.
-        """
-        from pathlib import Path
-        from datetime import datetime as dt
 
-        # Ensure markers
-        try:
-            STARTUP_INPROGRESS_FILE.write_text(f"started:{datetime.now().isoformat()}\n")
-        except Exception:
-            pass
+def _prune_startup_outputs(directory) -> int:
+    """
+    Delete the artifacts left behind by a full startup upload.
 
-        # Load small-duration for startup test
-        duration = int(os.getenv('STARTUP_VERIFICATION_FULL_DURATION_SEC', '6'))
-        timestamp = dt.now().strftime('%Y%m%d_%H%M%S')
-
-        # Prepare minimal script_data
-        script_text = os.getenv('STARTUP_VERIFICATION_FULL_TEXT', 'Quick startup verification. [PAUSE]')
-        script_data = {
-            'script': script_text,
-            'duration_seconds': duration,
-            'visual_cues': [
-                {'time_seconds': 0, 'duration_seconds': duration, 'type': 'text', 'content': 'Startup verification'}
-            ]
-        }
+    A single scandir pass; only files named with the startup prefixes are
+    removed so regular pipeline output in the same folder is left alone.
 
-        out_dir = Path('output/shorts')
-        out_dir.mkdir(parents=True, exist_ok=True)
-        srt_path = out_dir / f'captions_{timestamp}.srt'
+    Args:
+        directory: Output folder to prune
 
-        # Write very small srt
-        try:
-            srt_text = '1\n00:00:00,000 --> 00:00:0{} ,000\n{}\n\n'.format(min(duration,9), script_text.replace('[PAUSE]',''))
-            srt_path.write_text(srt_text)
-        except Exception:
-            srt_path = None
+    Returns:
+        int: Number of files removed
+    """
+    removed = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(STARTUP_OUTPUT_PREFIXES) and entry.is_file():
+                    with suppress(OSError):
+                        os.unlink(entry.path)
+                        removed += 1
+    except FileNotFoundError:
+        pass
+    return removed
 
-        # Generate thumbnail
-        thumb_path = None
-        try:
-            from scripts.thumbnail_generator import generate_shorts_thumbnail
-            thumb_path = generate_shorts_thumbnail('Startup Verification', out_dir)
-        except Exception:
-            thumb_path = None
 
-        # Generate TTS sample using existing TTS generator; VideoEditor will also try
-        try:
-            from scripts.tts_generator import TTSGenerator
-            tts = TTSGenerator()
-            audio_out = out_dir / f'startup_audio_{timestamp}.mp3'
-            audio_path = tts.generate_speech(script_text, audio_out)
-        except Exception:
-            audio_path = None
+def _full_upload_thumbnail(out_dir: Path, timestamp: str) -> Optional[Path]:
+    """Thumbnail for the full startup upload, or None if generation fails."""
+    try:
+        return _render_startup_thumbnail('Startup Verification', out_dir / f'startup_thumbnail_{timestamp}.png')
+    except Exception:
+        return None
 
-        # Build output video path
-        output_file = str(out_dir / f'video_startup_{timestamp}.mp4')
 
-        # Notify health state
-        try:
-            from keep_alive import set_processing_state
-            set_processing_state(True, 'Startup Full Upload')
-        except Exception:
-            pass
+def _full_upload_audio(script_text: str, audio_out: Path) -> Optional[Path]:
+    """TTS sample for the full startup upload, or None if generation fails."""
+    try:
+        from scripts.tts_generator import TTSGenerator
+        tts = TTSGenerator(use_cache=False)  # exercise the provider, not the disk cache
+        return tts.generate_speech(script_text, audio_out)
+    except Exception:
+        return None
+
+
+def _perform_full_startup_upload() -> dict:
+    """Perform a minimal full upload on startup.
+
+    This builds a very short (configurable) video, uploads it to YouTube, and
+    writes the success flag so it won't run again if `STARTUP_VERIFICATION_RUN_ONCE`
+    is enabled. The video is intentionally minimal to reduce runtime and memory.
+    The in-progress marker is held by the calling process for the duration.
+    """
+    cfg = StartupConfig.from_env()
+
+    # Load small-duration for startup test
+    duration = cfg.full_duration
+    t0 = datetime.now()
+    timestamp = t0.strftime('%Y%m%d_%H%M%S')
+
+    # Prepare minimal script_data
+    script_text = cfg.full_text
+    script_data = {
+        'script': script_text,
+        'duration_seconds': duration,
+        'visual_cues': [
+            {'time_seconds': 0, 'duration_seconds': duration, 'type': 'text', 'content': 'Startup verification'}
+        ]
+    }
+
+    out_dir = OUTPUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    srt_path = out_dir / f'startup_captions_{timestamp}.srt'
+
+    # Write very small srt
+    try:
+        srt_text = _SRT_TEMPLATE.format(max(0, min(duration, 59)), _caption_text(script_text))
+        _write_small(srt_path, srt_text, fsync=False)
+    except Exception:
+        srt_path = None
+
+    # Thumbnail and TTS sample are independent (image render vs. TTS HTTP
+    # call), so produce them together; VideoEditor will also try TTS itself
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='startup-full') as pool:
+        thumb_future = pool.submit(_full_upload_thumbnail, out_dir, timestamp)
+        audio_future = pool.submit(_full_upload_audio, script_text, out_dir / f'startup_audio_{timestamp}.mp3')
+        thumb_path = thumb_future.result()
+        audio_path = audio_future.result()
+
+    # Build output video path
+    output_file = str(out_dir / f'startup_video_{timestamp}.mp4')
 
-        video_path = None
+    # Notify health state
+    try:
+        from keep_alive import set_processing_state
+        set_processing_state(True, 'Startup Full Upload')
+    except Exception:
+        pass
+
+    video_path = None
+    try:
+        # Reuse VideoEditor to assemble a minimal video
+        from scripts.video_editor import VideoEditor
+        ve = VideoEditor()
+        video_path = ve.create_shorts_video(
+            script_data=script_data,
+            captions_srt_path=str(srt_path) if srt_path and srt_path.exists() else None,
+            thumbnail_path=str(thumb_path) if thumb_path else None,
+            title=cfg.full_title,
+            output_file=output_file,
+            timestamp=timestamp
+        )
+    except Exception as e:
+        logger.error(f"❌ Full startup video assembly failed: {e}")
+
+    # Attempt upload if video created
+    video_id = None
+    if video_path:
         try:
-            # Reuse VideoEditor to assemble a minimal video
-            from scripts.video_editor import VideoEditor
-            ve = VideoEditor()
-            video_path = ve.create_shorts_video(
-                script_data=script_data,
-                captions_srt_path=str(srt_path) if srt_path and srt_path.exists() else None,
-                thumbnail_path=str(thumb_path) if thumb_path else None,
-                title=os.getenv('STARTUP_VERIFICATION_FULL_TITLE', 'Startup Verification Test'),
-                output_file=output_file,
-                timestamp=timestamp
-            )
+            from src.uploader import upload_to_youtube, generate_metadata_from_script
+            meta = generate_metadata_from_script(script_data, topic=cfg.topic)
+            video_id = upload_to_youtube(video_path, meta['title'], meta['description'], meta['tags'], thumbnail_path=str(thumb_path) if thumb_path else None)
+            logger.info(f"✅ Startup short uploaded: {video_id}")
         except Exception as e:
-            logger.error(f"❌ Full startup video assembly failed: {e}")
+            logger.error(f"❌ Startup upload failed: {e}")
+
+    # Clear health state
+    try:
+        from keep_alive import set_processing_state
+        set_processing_state(False)
+    except Exception:
+        pass
 
-        # Attempt upload if video created
-        video_id = None
-        if video_path:
+    # Finalize
+    if video_id:
+        _clear_failed_marker()
+        # Write flag file if run_once is enabled
+        if cfg.run_once:
             try:
-                from src.uploader import upload_to_youtube, generate_metadata_from_script
-                meta = generate_metadata_from_script(script_data, topic=os.getenv('TARGET_TOPIC', 'startup'))
-                video_id = upload_to_youtube(video_path, meta['title'], meta['description'], meta['tags'], thumbnail_path=str(thumb_path) if thumb_path else None)
-                logger.info(f"✅ Startup short uploaded: {video_id}")
-            except Exception as e:
-                logger.error(f"❌ Startup upload failed: {e}")
-
-        # Clear health state
+                _atomic_write_flag(_flag_file(), f"Verification completed at {t0.isoformat()}\nVideo ID: {video_id}\n")
+            except Exception:
+                pass
+
+        # Cleanup outputs if desired
         try:
-            from keep_alive import set_processing_state
-            set_processing_state(False)
+            if cfg.cleanup_outputs:
+                _prune_startup_outputs(OUTPUT_DIR)
         except Exception:
             pass
 
-        # Finalize
-        if video_id:
-            # Write flag file if run_once is enabled
-            if os.getenv('STARTUP_VERIFICATION_RUN_ONCE', 'false').lower() in ('true', '1', 'yes'):
-                try:
-                    STARTUP_FLAG_FILE.parent.mkdir(parents=True, exist_ok=True)
-                    STARTUP_FLAG_FILE.write_text(f"Verification completed at {datetime.now().isoformat()}\nVideo ID: {video_id}\n")
-                except Exception:
-                    pass
+        return {'status': 'success', 'video_id': video_id, 'timestamp': timestamp}
 
-            try:
-                if STARTUP_INPROGRESS_FILE.exists():
-                    STARTUP_INPROGRESS_FILE.unlink()
-            except Exception:
-                pass
+    # If we reach here, failed
+    try:
+        _write_failed_marker("Full startup upload failed")
+    except Exception:
+        pass
 
-            # Cleanup outputs if desired
-            try:
-                if os.getenv('CLEANUP_OUTPUT_AFTER_UPLOAD', 'true').lower() in ('true', '1', 'yes'):
-                    from scheduler import cleanup_output_folder
-                    cleanup_output_folder('output/shorts')
-            except Exception:
-                pass
+    return {'status': 'failed', 'message': 'Full startup upload failed', 'timestamp': timestamp}
 
-            return {'status': 'success', 'video_id': video_id, 'timestamp': timestamp}
 
-        # If we reach here, failed
-        try:
-            STARTUP_FAILED_FILE.parent.mkdir(parents=True, exist_ok=True)
-            STARTUP_FAILED_FILE.write_text(f"{datetime.now().isoformat()}\nFull startup upload failed\n")
-        except Exception:
-            pass
+def _run_full_startup_upload_subprocess() -> dict:
+    """
+    Run `_perform_full_startup_upload` in a child interpreter.
 
-        try:
-            if STARTUP_INPROGRESS_FILE.exists():
-                STARTUP_INPROGRESS_FILE.unlink()
-        except Exception:
-            pass
+    The full path imports the whole pipeline (LLM clients, TTS, MoviePy);
+    doing that in a child means the memory goes back to the OS when the
+    check finishes instead of staying in the long-running worker.
 
-        return {'status': 'failed', 'message': 'Full startup upload failed', 'timestamp': timestamp}
+    Returns:
+        dict: The child's result dict
+
+    Raises:
+        RuntimeError: If the child exits without reporting a result
+        subprocess.TimeoutExpired: If the child exceeds the timeout
+    """
+    timeout = StartupConfig.from_env().full_timeout
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get('PYTHONPATH')]))
+
+    # Health state lives in this process, so track it around the child
+    try:
+        from keep_alive import set_processing_state
+    except Exception:
+        set_processing_state = None
+    if set_processing_state:
+        set_processing_state(True, 'Startup Full Upload')
+
+    try:
+        # stderr (the child's logging) is inherited so progress shows up live
+        proc = subprocess.run(
+            [sys.executable, '-m', 'scripts.startup_verifier', '--full-upload'],
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+            timeout=timeout,
+        )
+    finally:
+        if set_processing_state:
+            set_processing_state(False)
+
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(FULL_UPLOAD_RESULT_PREFIX):
+            result = json.loads(line[len(FULL_UPLOAD_RESULT_PREFIX):])
+        elif line.strip():
+            logger.info(line)
+
+    if result is None:
+        raise RuntimeError(f"Full startup upload process exited with code {proc.returncode} without a result")
+    return result
 
 
 def run_startup_verification_if_enabled():
@@ -439,9 +1262,22 @@ def run_startup_verification_if_enabled():
     Returns:
         dict: Result from generate_startup_short() or None if disabled
     """
+    _ensure_dotenv()
     if should_run_startup_verification():
         logger.info("\n🔍 Startup verification enabled (STARTUP_VERIFICATION=true)")
         return generate_startup_short()
     else:
         logger.info("\n⏭️  Startup verification disabled (set STARTUP_VERIFICATION=true to enable)")
         return None
+
+
+if __name__ == '__main__':
+    # Child-process entry point used by _run_full_startup_upload_subprocess
+    if '--full-upload' in sys.argv:
+        _ensure_dotenv()
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        result = _perform_full_startup_upload()
+        print(FULL_UPLOAD_RESULT_PREFIX + json.dumps(result), flush=True)
@@ -1,17 +1,38 @@
 # FILE: scripts/thumbnail_generator.py
 # Thumbnail generation for YouTube Shorts
 
+import logging
+import threading
 from pathlib import Path
 from typing import Optional
 from src.generator import generate_visuals
 from scripts.config import get_config
 
+logger = logging.getLogger(__name__)
+
+# Output directories already created in this process
+_created_dirs = set()
+_created_dirs_lock = threading.Lock()
+
+
+def _ensure_output_dir(output_dir: Path) -> None:
+    """Create `output_dir` the first time it is used; later calls skip the syscalls."""
+    key = str(output_dir)
+    if key in _created_dirs:
+        return
+    with _created_dirs_lock:
+        if key not in _created_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            _created_dirs.add(key)
+
 
 class ThumbnailGenerator:
     """Generate thumbnails for YouTube Shorts."""
     
-    def __init__(self):
-        self.config = get_config()
+    @property
+    def config(self):
+        """Shared configuration, loaded on first access rather than per instance."""
+        return get_config()
     
     def generate_thumbnail(
         self,
@@ -29,7 +50,7 @@ class ThumbnailGenerator:
             Path to thumbnail image
         """
         try:
-            output_dir.mkdir(parents=True, exist_ok=True)
+            _ensure_output_dir(output_dir)
             
             # Use existing generate_visuals function (optimized for vertical format)
             thumbnail_path = generate_visuals(
@@ -38,11 +59,13 @@ class ThumbnailGenerator:
                 thumbnail_title=title
             )
             
-            print(f"✅ Thumbnail generated: {thumbnail_path}")
+            logger.info(f"✅ Thumbnail generated: {thumbnail_path}")
             return Path(thumbnail_path)
         
-        except Exception as e:
-            print(f"❌ Failed to generate thumbnail: {e}")
+        except (OSError, ValueError, ImportError):
+            # Disk, font/PIL and missing-dependency failures; anything else
+            # is a bug and propagates
+            logger.exception("❌ Failed to generate thumbnail")
             return None
 
 
@@ -60,8 +83,11 @@ def generate_shorts_thumbnail(
     Returns:
         Path to thumbnail image
     """
-    generator = ThumbnailGenerator()
-    return generator.generate_thumbnail(title, output_dir)
+    return _default_generator.generate_thumbnail(title, output_dir)
+
+
+# The generator holds no per-instance state, so callers share one
+_default_generator = ThumbnailGenerator()
 
 
 if __name__ == '__main__':
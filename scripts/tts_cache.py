@@ -0,0 +1,127 @@
+# FILE: scripts/tts_cache.py
+# Content-addressed on-disk cache for synthesized speech
+
+"""
+Cache synthesized MP3s so that repeated phrases (intros, outros, hook
+templates) are served from disk instead of another gTTS/TTSMaker round-trip.
+Startup verification bypasses the cache, since it has to reach the provider.
+
+Entries are keyed by a BLAKE2b digest of provider, language, speed and text
+and stored as ``<key>.mp3`` under ``config.cache_dir / 'tts'``. Writes go
+through a temp file in the same directory plus ``os.replace`` so concurrent
+workers never read a partial file. When the directory grows past its size
+cap the least recently used entries are removed.
+
+Hits are hardlinked to the destination when it is on the same filesystem.
+The destination then shares its inode with the cache entry, so callers must
+replace the file (unlink/os.replace) rather than rewrite it in place.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+# Evict down to this fraction of the cap so eviction doesn't run on every store
+EVICT_TARGET_RATIO = 0.9
+
+
+def tts_cache_key(text: str, provider: str, language: str, speed: str) -> str:
+    """Key for one synthesized utterance; any input that changes the audio is part of it."""
+    raw = '\x1f'.join((provider.lower(), language, str(speed), text))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class TTSCache:
+    """Directory of cached MP3s with LRU eviction by size."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.mp3'
+
+    def fetch(self, key: str, dest: Path) -> Optional[Path]:
+        """
+        Hardlink (or, across filesystems, copy) the cached audio for `key` to `dest`.
+
+        Returns:
+            `dest` on a hit, None on a miss
+        """
+        entry = self._entry(key)
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            # An existing dest may itself be a link to another entry; drop it
+            # rather than overwrite through it
+            dest.unlink(missing_ok=True)
+            try:
+                os.link(entry, dest)
+            except FileNotFoundError:
+                return None
+            except OSError:
+                shutil.copyfile(entry, dest)
+        except FileNotFoundError:
+            return None
+        # Many mounts are noatime; bump mtime so eviction sees the use
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return dest
+
+    def store(self, key: str, src: Path) -> None:
+        """Atomically add `src` under `key`, then evict if over the size cap."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out, open(src, 'rb') as f:
+                shutil.copyfileobj(f, out)
+            os.replace(tmp, self._entry(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._evict()
+
+    def _evict(self) -> int:
+        """Remove least recently used entries once the cache exceeds max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    for entry in it:
+                        if not entry.name.endswith('.mp3'):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((max(st.st_atime, st.st_mtime), st.st_size, entry.path))
+                        total += st.st_size
+            except FileNotFoundError:
+                return 0
+            if total <= self.max_bytes:
+                return 0
+
+            target = self.max_bytes * EVICT_TARGET_RATIO
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
@@ -1,8 +1,15 @@
 # FILE: scripts/tts_generator.py
 # Text-to-Speech generation for YouTube Shorts scripts
 
+import asyncio
+import math
 import os
 import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Literal
 import requests
@@ -17,29 +24,156 @@ try:
 except ImportError:
     AudioSegment = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 from scripts.config import get_config
+from scripts.tts_cache import TTSCache, tts_cache_key
+from scripts.utils import PAUSE_RE, get_http_session
+
+TTSMAKER_URL = 'https://api.ttsmaker.com/v1/tts'
+TTSMAKER_SPEEDS = {'slow': '0.5', 'normal': '1.0', 'fast': '1.5'}
+TTSMAKER_STREAM_CHUNK_BYTES = 64 * 1024
 
 
+@lru_cache(maxsize=256)
 def split_for_tts(script: str):
     """Split a script into chunks on the [PAUSE] token and clean whitespace.
 
-    Returns a list of non-empty chunks in order.
+    Memoized, since the same script is often voiced more than once per run.
+    Returns a tuple (shared between callers) of non-empty chunks in order.
     """
     if not script:
-        return []
-    parts = [p.strip() for p in script.split('[PAUSE]')]
-    return [p for p in parts if p]
+        return ()
+    return tuple(p for p in PAUSE_RE.split(script.strip()) if p)
+
+
+# Gain applied when converting to WAV, as fixed point (x/65536, ~0.90)
+WAV_GAIN_Q16 = 58982
+
+# Silence inserted between [PAUSE] chunks
+PAUSE_SILENCE_MS = 300
+
+# MPEG audio Layer III header tables, indexed by the header's version bits
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_MP3_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MP3_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_MP3_VBR_TAGS = (b'Xing', b'Info', b'VBRI')
+
+
+def _mp3_audio_span(data: bytes):
+    """Locate the MPEG audio frames of an MP3 file held in memory.
+
+    Skips a leading ID3v2 tag, a Xing/Info/VBRI header frame and a trailing
+    ID3v1 tag, so the result can be appended to other frames verbatim.
+
+    Returns:
+        (start, end, (sample_rate, channels)), or None if `data` doesn't start
+        with a Layer III frame
+    """
+    start = 0
+    if data[:3] == b'ID3' and len(data) >= 10:
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        start = 10 + size + (10 if data[5] & 0x10 else 0)
+    end = len(data)
+    if end - start >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128
+
+    header = data[start:start + 4]
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 3
+    layer = (header[1] >> 1) & 3
+    bitrate_idx = header[2] >> 4
+    rate_idx = (header[2] >> 2) & 3
+    if version not in _MP3_SAMPLE_RATES or layer != 1 or rate_idx == 3 or bitrate_idx in (0, 15):
+        return None
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+    channels = 1 if header[3] >> 6 == 3 else 2
+
+    if version == 3:
+        frame_len = 144000 * _MP3_BITRATES_V1[bitrate_idx] // sample_rate
+    else:
+        frame_len = 72000 * _MP3_BITRATES_V2[bitrate_idx] // sample_rate
+    frame_len += (header[2] >> 1) & 1
+    # Encoders put the VBR header in an otherwise silent first frame; it
+    # describes this file only and would misreport the stitched length
+    first_frame = data[start + 4:start + frame_len]
+    if any(tag in first_frame[:48] for tag in _MP3_VBR_TAGS):
+        start += frame_len
+    return start, end, (sample_rate, channels)
+
+
+@lru_cache(maxsize=8)
+def _silence_frames(cache_dir: Path, sample_rate: int, channels: int) -> Optional[bytes]:
+    """MP3 frames of PAUSE_SILENCE_MS silence, encoded once and kept in cache_dir."""
+    path = cache_dir / f'silence_{PAUSE_SILENCE_MS}ms_{sample_rate}_{channels}.mp3'
+    try:
+        if not path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            silence = AudioSegment.silent(duration=PAUSE_SILENCE_MS, frame_rate=sample_rate).set_channels(channels)
+            silence.export(str(tmp), format='mp3', parameters=['-ar', str(sample_rate)])
+            os.replace(tmp, path)
+        data = path.read_bytes()
+    except Exception as e:
+        print(f"⚠️ Could not prepare MP3 silence: {e}")
+        return None
+    span = _mp3_audio_span(data)
+    if span is None or span[2] != (sample_rate, channels):
+        return None
+    return data[span[0]:span[1]]
+
+
+# Attempts per [PAUSE] chunk; gTTS occasionally answers 429 under load.
+# This is the only retry layer for synthesis: the shared HTTP session does
+# not resend the (billed) TTSMaker POST
+CHUNK_ATTEMPTS = 3
+CHUNK_RETRY_BASE_SECONDS = 0.5
+
+
+@lru_cache(maxsize=None)
+def _gtts_lang(lang: str) -> str:
+    """Validate `lang` against gTTS's language table once per process.
+
+    Each gTTS() rebuilds that table when lang_check is on; doing the check
+    here lets every chunk skip it. Returns the language gTTS resolves to
+    (deprecated codes are mapped), raising ValueError if unsupported.
+    """
+    return gTTS(text=' ', lang=lang).lang
+
+
+@lru_cache(maxsize=None)
+def _provider_semaphore(provider: str, limit: int) -> threading.BoundedSemaphore:
+    """Process-wide cap on concurrent requests to one TTS provider."""
+    return threading.BoundedSemaphore(limit)
 
 
 class TTSGenerator:
     """Generate voiceovers from text using TTS services."""
     
-    def __init__(self):
-        """Initialize TTS generator."""
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize TTS generator.
+        
+        Args:
+            use_cache: Serve and store audio through the TTS disk cache (when
+                enabled in config); False always reaches the provider
+        """
         self.config = get_config()
         self.provider = self.config.tts_provider.lower()
         self.language = self.config.tts_language
         self.speed = self.config.tts_speed
+        self.cache = None
+        if use_cache and self.config.tts_cache_enabled:
+            self.cache = TTSCache(self.config.cache_dir / 'tts', self.config.tts_cache_max_mb * 1024 * 1024)
     
     def generate_speech(
         self,
@@ -64,30 +198,91 @@ class TTSGenerator:
         print(f"🎤 Generating speech using {provider}...")
         
         try:
-            # If the script includes [PAUSE] and pydub is available, synthesize
-            # each chunk separately and concatenate with short silences for more
-            # natural pacing in TTS.
-            if '[PAUSE]' in text and AudioSegment is not None:
-                return self._generate_with_pauses(text, output_path, provider)
+            if self.cache is None:
+                return self._synthesize(text, output_path, provider)
 
+            # Cache the MP3 and convert on the way out, so WAV requests hit too
+            if provider == 'ttsmaker' and not self.config.ttsmaker_api_key:
+                provider = 'gtts'  # what _generate_with_ttsmaker falls back to
+            key = tts_cache_key(text, provider, self.language, self.speed)
+            mp3_path = output_path.with_suffix('.mp3')
+            if self.cache.fetch(key, mp3_path):
+                print(f"✅ Speech served from TTS cache: {mp3_path}")
+            else:
+                # mp3_path may be a hardlink to a cache entry from an earlier
+                # hit; unlink so the backend writes a new file, not the entry
+                mp3_path.unlink(missing_ok=True)
+                # No silent gTTS fallback here: its audio must not be stored
+                # under the TTSMaker key
+                produced = self._synthesize(text, mp3_path, provider, fallback=False)
+                if produced is None and provider == 'ttsmaker':
+                    print(f"   Falling back to gTTS")
+                    key = tts_cache_key(text, 'gtts', self.language, self.speed)
+                    mp3_path.unlink(missing_ok=True)
+                    produced = self._synthesize(text, mp3_path, 'gtts')
+                if produced is None:
+                    return None
+                try:
+                    self.cache.store(key, produced)
+                except OSError as e:
+                    print(f"⚠️ Could not cache speech: {e}")
+            return self._as_requested_format(mp3_path, output_path)
+
+        except Exception as e:
+            print(f"❌ ERROR: Failed to generate speech: {e}")
+            return None
+
+    def _as_requested_format(self, mp3_path: Path, output_path: Path) -> Path:
+        """Convert a cached/synthesized MP3 to WAV when `output_path` asks for it."""
+        if output_path.suffix.lower() != '.wav':
+            return mp3_path
+        wav_path = self._mp3_to_wav(mp3_path)
+        if wav_path:
+            mp3_path.unlink(missing_ok=True)
+            return wav_path
+        print(f"   ⚠️ MP3 to WAV conversion failed, returning MP3")
+        return mp3_path
+
+    def _synthesize(
+        self,
+        text: str,
+        output_path: Path,
+        provider: str,
+        fallback: bool = True,
+    ) -> Optional[Path]:
+        """Run the configured TTS backend (no caching).
+
+        With `fallback` False a failing TTSMaker returns None instead of
+        switching to gTTS, so callers know which provider made the audio.
+        """
+        # If the script includes [PAUSE] and pydub is available, synthesize
+        # each chunk separately and concatenate with short silences for more
+        # natural pacing in TTS.
+        if '[PAUSE]' in text and AudioSegment is not None:
+            return self._generate_with_pauses(text, output_path, provider, fallback)
+
+        with _provider_semaphore(provider, self.config.tts_concurrency):
             if provider == 'gtts':
                 return self._generate_with_gtts(text, output_path)
             elif provider == 'ttsmaker':
-                return self._generate_with_ttsmaker(text, output_path)
+                return self._generate_with_ttsmaker(text, output_path, fallback)
             else:
                 print(f"⚠️ Unknown TTS provider: {provider}. Falling back to gTTS")
                 return self._generate_with_gtts(text, output_path)
 
-        except Exception as e:
-            print(f"❌ ERROR: Failed to generate speech: {e}")
-            return None
-
-    def _generate_with_pauses(self, script: str, output_path: Path, provider: Optional[str]):
+    def _generate_with_pauses(
+        self,
+        script: str,
+        output_path: Path,
+        provider: Optional[str],
+        fallback: bool = True,
+    ):
         """Generate speech for a script that contains [PAUSE] tokens.
 
         This method splits the script, generates per-chunk audio files, and
         concatenates them with short silences using pydub. Returns the final
-        audio file path (MP3 by default).
+        audio file path (MP3 by default). Without `fallback`, any chunk the
+        provider fails on fails the whole script.
         """
         provider = provider or self.provider
         chunks = split_for_tts(script)
@@ -98,32 +293,28 @@ class TTSGenerator:
         chunk_files = []
 
         try:
-            for i, chunk in enumerate(chunks):
-                chunk_path = temp_dir / f'chunk_{i}.mp3'
-                # Use the underlying generator for each chunk but force mp3
-                if provider == 'ttsmaker':
-                    self._generate_with_ttsmaker(chunk, chunk_path)
-                else:
-                    # Default to gTTS for chunk generation
-                    self._generate_with_gtts(chunk, chunk_path)
-                if chunk_path.exists():
-                    chunk_files.append(chunk_path)
+            # Chunks are independent network calls: synthesize them in
+            # parallel and collect the results in script order
+            workers = min(len(chunks), self.config.tts_concurrency)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tts-chunk') as pool:
+                futures = [
+                    pool.submit(self._generate_chunk, chunk, temp_dir / f'chunk_{i}.mp3', provider, fallback)
+                    for i, chunk in enumerate(chunks)
+                ]
+                for future in futures:
+                    chunk_path = future.result()
+                    if chunk_path is not None:
+                        chunk_files.append(chunk_path)
 
-            if not chunk_files:
+            if not chunk_files or (not fallback and len(chunk_files) != len(chunks)):
                 return None
 
-            # Load all chunks and append 300ms silence between them
-            silence = AudioSegment.silent(duration=300)
-            final_audio = AudioSegment.empty()
-            for i, fpath in enumerate(chunk_files):
-                seg = AudioSegment.from_file(str(fpath))
-                final_audio += seg
-                if i < len(chunk_files) - 1:
-                    final_audio += silence
-
             output_path.parent.mkdir(parents=True, exist_ok=True)
             mp3_path = output_path.with_suffix('.mp3')
-            final_audio.export(str(mp3_path), format='mp3')
+            # Chunks in the same MP3 format can be spliced frame by frame;
+            # only decode and re-encode when they disagree
+            if not self._append_mp3_frames(chunk_files, mp3_path):
+                self._stitch_chunks(chunk_files).export(str(mp3_path), format='mp3')
 
             # Convert to WAV if requested
             if output_path.suffix.lower() == '.wav':
@@ -145,6 +336,104 @@ class TTSGenerator:
             except Exception:
                 pass
     
+    def _append_mp3_frames(self, chunk_files: list, mp3_path: Path) -> bool:
+        """Write chunks and pre-encoded silence frames straight into `mp3_path`.
+
+        Returns:
+            False, without writing, if the chunks don't share sample rate and
+            channel layout or no matching silence is available
+        """
+        spans = []
+        for fpath in chunk_files:
+            data = fpath.read_bytes()
+            span = _mp3_audio_span(data)
+            if span is None:
+                return False
+            spans.append((data, span))
+
+        params = spans[0][1][2]
+        if any(span[2] != params for _, span in spans):
+            return False
+        silence = _silence_frames(self.config.cache_dir, *params)
+        if silence is None:
+            return False
+
+        with open(mp3_path, 'wb') as out:
+            for i, (data, (start, end, _)) in enumerate(spans):
+                if i:
+                    out.write(silence)
+                out.write(memoryview(data)[start:end])
+        return True
+
+    def _stitch_chunks(self, chunk_files: list):
+        """Join decoded chunks with PAUSE_SILENCE_MS of silence in one pass.
+
+        Appending AudioSegments copies the whole accumulated buffer each time;
+        instead decode every chunk once, lay the raw PCM out with a single
+        concatenate and wrap it in one AudioSegment.
+        """
+        segments = [AudioSegment.from_file(str(fpath)) for fpath in chunk_files]
+        first = segments[0]
+        frame_rate, channels = first.frame_rate, first.channels
+        # Chunks from one provider normally agree already; these are no-ops then
+        segments = [
+            seg.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(2)
+            for seg in segments
+        ]
+
+        silence_frames = frame_rate * PAUSE_SILENCE_MS // 1000
+        if np is not None:
+            silence = np.zeros(silence_frames * channels, dtype=np.int16)
+            parts = []
+            for i, seg in enumerate(segments):
+                if i:
+                    parts.append(silence)
+                parts.append(np.frombuffer(seg.raw_data, dtype=np.int16))
+            data = np.concatenate(parts).tobytes()
+        else:
+            data = (b'\x00' * (silence_frames * channels * 2)).join(seg.raw_data for seg in segments)
+
+        return AudioSegment(data=data, sample_width=2, frame_rate=frame_rate, channels=channels)
+
+    def _generate_chunk(
+        self,
+        chunk: str,
+        chunk_path: Path,
+        provider: str,
+        fallback: bool = True,
+    ) -> Optional[Path]:
+        """Synthesize one [PAUSE] chunk to MP3, retrying with backoff.
+
+        With `fallback`, a chunk TTSMaker still fails after every attempt is
+        voiced once with gTTS (not once per attempt).
+        """
+        if provider == 'ttsmaker' and fallback and not self.config.ttsmaker_api_key:
+            print("⚠️ TTSMAKER_API_KEY not configured. Falling back to gTTS")
+            provider = 'gtts'
+        semaphore = _provider_semaphore(provider, self.config.tts_concurrency)
+        for attempt in range(CHUNK_ATTEMPTS):
+            if attempt:
+                time.sleep(CHUNK_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            with semaphore:
+                # Use the underlying generator for each chunk but force mp3
+                if provider == 'ttsmaker':
+                    produced = self._generate_with_ttsmaker(chunk, chunk_path, fallback=False)
+                else:
+                    # Default to gTTS for chunk generation
+                    produced = self._generate_with_gtts(chunk, chunk_path)
+            if produced is not None:
+                return chunk_path
+            # Don't let a partially streamed file pass for a finished chunk
+            chunk_path.unlink(missing_ok=True)
+
+        if fallback and provider == 'ttsmaker':
+            print(f"   Falling back to gTTS")
+            with _provider_semaphore('gtts', self.config.tts_concurrency):
+                if self._generate_with_gtts(chunk, chunk_path) is not None:
+                    return chunk_path
+            chunk_path.unlink(missing_ok=True)
+        return None
+
     def _generate_with_gtts(
         self,
         text: str,
@@ -170,7 +459,7 @@ class TTSGenerator:
             mp3_path = output_path.with_suffix('.mp3')
             
             print(f"   Generating MP3 with gTTS...")
-            tts = gTTS(text=text, lang=self.language, slow=False)
+            tts = gTTS(text=text, lang=_gtts_lang(self.language), slow=False, lang_check=False)
             tts.save(str(mp3_path))
             
             # Convert to WAV if requested
@@ -197,6 +486,7 @@ class TTSGenerator:
         self,
         text: str,
         output_path: Path,
+        fallback: bool = True,
     ) -> Optional[Path]:
         """
         Generate speech using TTSMaker API.
@@ -204,6 +494,7 @@ class TTSGenerator:
         Args:
             text: Text to convert
             output_path: Output path
+            fallback: Use gTTS when TTSMaker is unconfigured or unreachable
             
         Returns:
             Path to generated audio file, or None if failed
@@ -211,39 +502,31 @@ class TTSGenerator:
         api_key = self.config.ttsmaker_api_key
         
         if not api_key:
+            if not fallback:
+                print("⚠️ TTSMAKER_API_KEY not configured")
+                return None
             print("⚠️ TTSMAKER_API_KEY not configured. Falling back to gTTS")
             return self._generate_with_gtts(text, output_path)
         
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Map speed to TTSMaker value
-            speed_map = {'slow': '0.5', 'normal': '1.0', 'fast': '1.5'}
-            speed_value = speed_map.get(self.speed, '1.0')
-            
             # Call TTSMaker API
             print(f"   Calling TTSMaker API...")
-            url = 'https://api.ttsmaker.com/v1/tts'
-            
-            payload = {
-                'text': text,
-                'voice_id': '0',  # Default voice
-                'audio_format': 'mp3',
-                'audio_speed': speed_value,
-            }
-            
             headers = {
                 'Authorization': f'Bearer {api_key}',
                 'Content-Type': 'application/json',
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=60)
-            response.raise_for_status()
-            
-            # Save audio file
+            # Stream the audio to disk instead of holding the whole MP3 in memory
             mp3_path = output_path.with_suffix('.mp3')
-            with open(mp3_path, 'wb') as f:
-                f.write(response.content)
+            with get_http_session().post(
+                TTSMAKER_URL, json=self._ttsmaker_payload(text), headers=headers, timeout=60, stream=True
+            ) as response:
+                response.raise_for_status()
+                with open(mp3_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=TTSMAKER_STREAM_CHUNK_BYTES):
+                        f.write(chunk)
             
             # Convert to WAV if requested
             if output_path.suffix.lower() == '.wav':
@@ -261,12 +544,23 @@ class TTSGenerator:
         
         except requests.exceptions.RequestException as e:
             print(f"❌ TTSMaker API error: {e}")
+            if not fallback:
+                return None
             print(f"   Falling back to gTTS")
             return self._generate_with_gtts(text, output_path)
         except Exception as e:
             print(f"❌ TTSMaker error: {e}")
             return None
     
+    def _ttsmaker_payload(self, text: str) -> dict:
+        """TTSMaker request body for `text` at the configured speed."""
+        return {
+            'text': text,
+            'voice_id': '0',  # Default voice
+            'audio_format': 'mp3',
+            'audio_speed': TTSMAKER_SPEEDS.get(self.speed, '1.0'),
+        }
+
     def _mp3_to_wav(self, mp3_path: Path) -> Optional[Path]:
         """
         Convert MP3 to WAV format.
@@ -285,14 +579,19 @@ class TTSGenerator:
         try:
             wav_path = mp3_path.with_suffix('.wav')
             
-            # Load MP3 and export as WAV
-            audio = AudioSegment.from_mp3(str(mp3_path))
-            audio.export(
-                str(wav_path),
-                format='wav',
-                codec='pcm_s16le',  # 16-bit PCM
-                parameters=['-q:a', '9', '-filter:a', 'volume=0.90']
-            )
+            # Decode once, apply the gain in-process and write 16-bit PCM
+            # with the stdlib, instead of a second ffmpeg pass for the filter
+            audio = AudioSegment.from_mp3(str(mp3_path)).set_sample_width(2)
+            if np is not None:
+                samples = np.frombuffer(audio.raw_data, dtype=np.int16).astype(np.int32)
+                pcm = ((samples * WAV_GAIN_Q16) >> 16).astype(np.int16).tobytes()
+            else:
+                pcm = audio.apply_gain(20 * math.log10(WAV_GAIN_Q16 / 65536)).raw_data
+            with wave.open(str(wav_path), 'wb') as wav:
+                wav.setnchannels(audio.channels)
+                wav.setsampwidth(2)
+                wav.setframerate(audio.frame_rate)
+                wav.writeframes(pcm)
             
             print(f"✅ Converted to WAV: {wav_path}")
             return wav_path
@@ -317,25 +616,121 @@ class TTSGenerator:
             Dictionary mapping IDs to audio file paths
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        audio_files = {}
+        # Pre-fill so the result keeps the input order whatever finishes first
+        audio_files = dict.fromkeys(texts)
+        if not texts:
+            return audio_files
         
-        for text_id, text in texts.items():
-            output_path = output_dir / f"audio_{text_id}.mp3"
-            
-            try:
-                audio_path = self.generate_speech(text, output_path)
-                if audio_path:
-                    audio_files[text_id] = audio_path
-                    print(f"✅ {text_id}: {audio_path}")
-                else:
-                    print(f"⚠️ {text_id}: Failed")
-                    audio_files[text_id] = None
-            except Exception as e:
-                print(f"❌ {text_id}: {e}")
-                audio_files[text_id] = None
+        # Each item is an independent network-bound synthesis; the per-provider
+        # semaphore still caps how many requests are in flight
+        workers = min(len(texts), self.config.tts_concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tts-batch') as pool:
+            futures = {
+                pool.submit(self.generate_speech, text, output_dir / f"audio_{text_id}.mp3"): text_id
+                for text_id, text in texts.items()
+            }
+            for future in as_completed(futures):
+                text_id = futures[future]
+                try:
+                    audio_path = future.result()
+                    if audio_path:
+                        audio_files[text_id] = audio_path
+                        print(f"✅ {text_id}: {audio_path}")
+                    else:
+                        print(f"⚠️ {text_id}: Failed")
+                except Exception as e:
+                    print(f"❌ {text_id}: {e}")
+        
+        return audio_files
+
+    async def agenerate_batch(
+        self,
+        texts: dict,
+        output_dir: Path,
+    ) -> dict:
+        """
+        Async variant of `generate_batch`.
         
+        With the TTSMaker provider and aiohttp installed, requests are issued
+        from the event loop over one pooled client session; everything else
+        (gTTS, [PAUSE] scripts, missing key or aiohttp) runs `generate_speech`
+        in worker threads. At most `config.tts_concurrency` syntheses are in
+        flight at once.
+        
+        Args:
+            texts: Dictionary mapping IDs to text strings
+            output_dir: Output directory
+            
+        Returns:
+            Dictionary mapping IDs to audio file paths
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        audio_files = dict.fromkeys(texts)
+        if not texts:
+            return audio_files
+
+        semaphore = asyncio.Semaphore(self.config.tts_concurrency)
+        api_key = self.config.ttsmaker_api_key
+        use_http = aiohttp is not None and self.provider == 'ttsmaker' and bool(api_key)
+
+        async def _run(session, text_id, text):
+            output_path = output_dir / f"audio_{text_id}.mp3"
+            async with semaphore:
+                if session is None or '[PAUSE]' in text:
+                    return await asyncio.to_thread(self.generate_speech, text, output_path)
+                return await self._agenerate_with_ttsmaker(session, text, output_path)
+
+        async def _gather(session):
+            return await asyncio.gather(
+                *(_run(session, text_id, text) for text_id, text in texts.items()),
+                return_exceptions=True,
+            )
+
+        if use_http:
+            timeout = aiohttp.ClientTimeout(total=60)
+            headers = {'Authorization': f'Bearer {api_key}'}
+            async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+                results = await _gather(session)
+        else:
+            results = await _gather(None)
+
+        for text_id, result in zip(texts, results):
+            if isinstance(result, Exception):
+                print(f"❌ {text_id}: {result}")
+            elif result:
+                audio_files[text_id] = result
+                print(f"✅ {text_id}: {result}")
+            else:
+                print(f"⚠️ {text_id}: Failed")
         return audio_files
 
+    async def _agenerate_with_ttsmaker(self, session, text: str, output_path: Path) -> Optional[Path]:
+        """Synthesize one MP3 through TTSMaker on `session`, honouring the TTS cache."""
+        key = tts_cache_key(text, 'ttsmaker', self.language, self.speed)
+        if self.cache is not None and await asyncio.to_thread(self.cache.fetch, key, output_path):
+            print(f"✅ Speech served from TTS cache: {output_path}")
+            return output_path
+
+        try:
+            async with session.post(TTSMAKER_URL, json=self._ttsmaker_payload(text)) as response:
+                response.raise_for_status()
+                data = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"❌ TTSMaker API error: {e}")
+            # The sync path retries TTSMaker and then falls back to gTTS
+            return await asyncio.to_thread(self.generate_speech, text, output_path)
+
+        # Replace rather than rewrite: output_path may be linked to a cache entry
+        await asyncio.to_thread(output_path.unlink, missing_ok=True)
+        await asyncio.to_thread(output_path.write_bytes, data)
+        if self.cache is not None:
+            try:
+                await asyncio.to_thread(self.cache.store, key, output_path)
+            except OSError as e:
+                print(f"⚠️ Could not cache speech: {e}")
+        print(f"✅ Speech generated successfully: {output_path}")
+        return output_path
+
 
 def generate_speech(
     text: str,
@@ -20,13 +20,16 @@ import os
 import sys
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from pathlib import Path
 import tempfile
+from contextlib import contextmanager
+from typing import Optional
 
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.cron import CronTrigger
-import pytz
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the lock file's age
+    fcntl = None
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('upload_scheduler')
@@ -39,38 +42,97 @@ def _get_lock_path():
 
 def _is_locked(max_age_hours: int = 4) -> bool:
     lock = _get_lock_path()
-    if not lock.exists():
-        return False
     try:
-        mtime = datetime.fromtimestamp(lock.stat().st_mtime)
-        if datetime.utcnow() - mtime > timedelta(hours=max_age_hours):
+        # Epoch seconds on both sides, so the local timezone can't skew the age
+        if time.time() - lock.stat().st_mtime > max_age_hours * 3600:
             # stale lock
             logger.warning('Found stale lock file; removing')
             try:
-                lock.unlink()
-            except Exception:
+                lock.unlink(missing_ok=True)
+            except OSError:
                 pass
             return False
         return True
+    except FileNotFoundError:
+        return False
     except Exception:
         return True
 
 
-def _create_lock():
+# Retries when the lock file is released or replaced while we open it
+LOCK_ATTEMPTS = 3
+
+
+def _open_lock() -> Optional[int]:
+    """Create (or reclaim) and lock the lock file; None if a live run holds it."""
     lock = _get_lock_path()
+    for _ in range(LOCK_ATTEMPTS):
+        reclaimed = False
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if fcntl is None:
+                if _is_locked():
+                    return None
+                continue  # stale lock was removed
+            try:
+                fd = os.open(lock, os.O_WRONLY)
+            except FileNotFoundError:
+                continue  # released in between
+            reclaimed = True
+
+        if fcntl is None:
+            return fd
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+
+        # The holder unlinks before closing, so we may have locked a file
+        # that is no longer at the lock path; start over if so
+        try:
+            current = os.path.samestat(os.fstat(fd), os.stat(lock))
+        except FileNotFoundError:
+            current = False
+        if current:
+            if reclaimed:
+                logger.warning('Reclaiming lock file left by a run that exited without releasing it')
+            return fd
+        os.close(fd)
+    return None
+
+
+@contextmanager
+def _acquire_lock():
+    """
+    Hold the run lock for the duration of the block.
+
+    Yields False when another run holds it. The file is created with O_EXCL
+    and flock()ed, so two instances can't both take it, and the kernel drops
+    the flock if the holder dies, which lets the next run reclaim the file.
+    """
     try:
-        lock.write_text(f"pid:{os.getpid()}\nstart:{datetime.utcnow().isoformat()}\n")
-    except Exception as e:
+        fd = _open_lock()
+    except OSError as e:
         logger.warning(f'Could not create lock file: {e}')
+        yield True
+        return
+    if fd is None:
+        yield False
+        return
 
-
-def _remove_lock():
-    lock = _get_lock_path()
     try:
-        if lock.exists():
-            lock.unlink()
-    except Exception as e:
-        logger.warning(f'Could not remove lock file: {e}')
+        os.ftruncate(fd, 0)
+        os.write(fd, f"pid:{os.getpid()}\nstart:{datetime.now(timezone.utc).isoformat()}\n".encode())
+        yield True
+    finally:
+        # Unlink while still holding the flock so a waiter never locks a dead file
+        try:
+            _get_lock_path().unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f'Could not remove lock file: {e}')
+        os.close(fd)
 
 
 def _log_result(summary: str):
@@ -87,37 +149,42 @@ def job_wrapper(run_func):
 
     def job():
         start_ts = datetime.now()
+        t0 = time.monotonic()
         logger.info(f"Job starting at {start_ts.isoformat()}")
 
-        if _is_locked():
-            msg = "Previous run still in progress - skipping this scheduled run"
-            logger.warning(msg)
-            _log_result(msg)
-            return
+        with _acquire_lock() as held:
+            if not held:
+                msg = "Previous run still in progress - skipping this scheduled run"
+                logger.warning(msg)
+                _log_result(msg)
+                return
 
-        _create_lock()
-        try:
-            # Call the provided run function
-            result = None
             try:
-                result = run_func()
-                msg = f"Run completed successfully: {result}"
-                logger.info(msg)
-                _log_result(msg)
-            except Exception as e:
-                msg = f"Run failed: {e}"
-                logger.exception(msg)
-                _log_result(msg)
-        finally:
-            _remove_lock()
-            end_ts = datetime.now()
-            duration = (end_ts - start_ts).total_seconds()
-            logger.info(f"Job finished at {end_ts.isoformat()} (duration {duration:.1f}s)")
+                # Call the provided run function
+                result = None
+                try:
+                    result = run_func()
+                    msg = f"Run completed successfully: {result}"
+                    logger.info(msg)
+                    _log_result(msg)
+                except Exception as e:
+                    msg = f"Run failed: {e}"
+                    logger.exception(msg)
+                    _log_result(msg)
+            finally:
+                end_ts = datetime.now()
+                duration = time.monotonic() - t0
+                logger.info(f"Job finished at {end_ts.isoformat()} (duration {duration:.1f}s)")
 
     return job
 
 
 def main():
+    # Scheduler-only dependencies; the --once path never needs them
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from zoneinfo import ZoneInfo
+
     # Load cron or default
     cron_env = os.getenv('UPLOAD_SCHEDULE')
     default_cron = '0 9,18 * * *'  # 09:00 and 18:00 daily
@@ -125,10 +192,10 @@ def main():
 
     tz_name = os.getenv('LOCAL_TIMEZONE', os.getenv('TZ', 'UTC'))
     try:
-        tz = pytz.timezone(tz_name)
+        tz = ZoneInfo(tz_name)
     except Exception:
         logger.warning(f'Invalid timezone {tz_name}; falling back to UTC')
-        tz = pytz.UTC
+        tz = timezone.utc
 
     # Import the run function lazily (may be heavy)
     from scheduler import run_once_and_exit
@@ -1,19 +1,75 @@
 # FILE: scripts/utils.py
 # Utility functions for YouTube Shorts automation
 
+import fnmatch
+import importlib
 import os
 import logging
 import json
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import BytesIO
 
 try:
-    from PIL import Image
+    import orjson
 except ImportError:
-    Image = None
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _pil_image():
+    """PIL.Image, imported on first use so text/metadata callers don't load PIL; None if missing."""
+    try:
+        return importlib.import_module('PIL.Image')
+    except ImportError:
+        return None
+
+
+# ============================================================================
+# HTTP UTILITIES
+# ============================================================================
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Shared HTTP session for TTSMaker and Pexels calls.
+    
+    Connections are pooled so TLS setup is paid once per host. Idempotent
+    requests (the Pexels GETs) are retried with backoff on 429/5xx; POSTs
+    keep urllib3's default and are never resent after a response, since
+    TTSMaker bills each synthesis (TTSGenerator retries those per chunk).
+    
+    Returns:
+        Process-wide requests.Session
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                )
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _http_session = session
+    return _http_session
 
 
 # ============================================================================
@@ -95,6 +151,23 @@ def cleanup_directory(directory: Path, pattern: str = '*', keep_subdirs: bool =
         return 0
     
     count = 0
+    if '/' not in pattern and os.sep not in pattern and '**' not in pattern:
+        # Flat pattern: scandir entries carry the file type from readdir, so
+        # there is no per-file stat or Path object
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not (pattern == '*' or fnmatch.fnmatch(entry.name, pattern)):
+                    continue
+                try:
+                    if entry.is_file():
+                        os.unlink(entry.path)
+                        count += 1
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"⚠️ Failed to delete {entry.path}: {e}")
+        return count
+    
     for file_path in directory.glob(pattern):
         if keep_subdirs and file_path.is_dir():
             continue
@@ -113,6 +186,17 @@ def cleanup_directory(directory: Path, pattern: str = '*', keep_subdirs: bool =
 # METADATA UTILITIES
 # ============================================================================
 
+def _json_dumps_metadata(obj: Any) -> bytes:
+    """Indented UTF-8 JSON; orjson when installed. Unknown types (Path, ...) become strings."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(obj, indent=2, default=str).encode('utf-8')
+
+
 def save_metadata(
     metadata: Dict[str, Any],
     output_file: Path,
@@ -137,8 +221,7 @@ def save_metadata(
         
         metadata['saved_at'] = datetime.now().isoformat()
         
-        with open(output_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        output_file.write_bytes(_json_dumps_metadata(metadata))
         
         return True
     except Exception as e:
@@ -185,18 +268,45 @@ def load_metadata(metadata_file: Path) -> Optional[Dict[str, Any]]:
 # VIDEO UTILITIES
 # ============================================================================
 
+# ffprobe only reads the container header, so it is far cheaper than opening
+# a moviepy clip; moviepy remains the fallback where ffprobe isn't installed
+FFPROBE_TIMEOUT_SECONDS = 30
+
+
+@lru_cache(maxsize=256)
+def _probe_duration(path: str, mtime_ns: int, size: int) -> float:
+    """Container duration via ffprobe; mtime/size in the key invalidate rewritten files."""
+    out = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', path],
+        capture_output=True,
+        check=True,
+        timeout=FFPROBE_TIMEOUT_SECONDS,
+    ).stdout
+    return float(json.loads(out)['format']['duration'])
+
+
+def _media_duration(path: Path, clip_class: str) -> float:
+    """Duration of a media file, via ffprobe when available, else moviepy's `clip_class`."""
+    if shutil.which('ffprobe'):
+        st = os.stat(path)
+        return _probe_duration(str(path), st.st_mtime_ns, st.st_size)
+
+    import moviepy.editor
+    clip = getattr(moviepy.editor, clip_class)(str(path))
+    try:
+        return clip.duration
+    finally:
+        clip.close()
+
+
 def get_video_duration(video_path: Path) -> float:
     """
     Get video duration in seconds.
     
-    Requires: moviepy or ffprobe
+    Requires: ffprobe or moviepy
     """
     try:
-        from moviepy.editor import VideoFileClip
-        clip = VideoFileClip(str(video_path))
-        duration = clip.duration
-        clip.close()
-        return duration
+        return _media_duration(video_path, 'VideoFileClip')
     except Exception as e:
         print(f"⚠️ Failed to get video duration for {video_path}: {e}")
         return 0.0
@@ -206,14 +316,10 @@ def get_audio_duration(audio_path: Path) -> float:
     """
     Get audio duration in seconds.
     
-    Requires: moviepy or ffprobe
+    Requires: ffprobe or moviepy
     """
     try:
-        from moviepy.editor import AudioFileClip
-        clip = AudioFileClip(str(audio_path))
-        duration = clip.duration
-        clip.close()
-        return duration
+        return _media_duration(audio_path, 'AudioFileClip')
     except Exception as e:
         print(f"⚠️ Failed to get audio duration for {audio_path}: {e}")
         return 0.0
@@ -256,6 +362,9 @@ def extract_keywords(text: str, min_keywords: int = 3, max_keywords: int = 7) ->
     """
     Extract keywords from text (simple implementation).
     
+    Results are memoized, so repeated scripts (batch duplicates, cache hits,
+    streaming prefetch) only pay for extraction once.
+    
     Args:
         text: Input text
         min_keywords: Minimum keywords to extract
@@ -264,28 +373,51 @@ def extract_keywords(text: str, min_keywords: int = 3, max_keywords: int = 7) ->
     Returns:
         List of keywords
     """
-    # Simple keyword extraction: words longer than 4 chars, excluding common words
-    common_words = {
-        'the', 'and', 'with', 'from', 'into', 'that', 'this', 'code',
-        'using', 'about', 'will', 'have', 'make', 'your', 'which'
-    }
-    
-    words = text.lower().split()
-    keywords = [
-        w.strip('.,!?;:')
-        for w in words
-        if len(w) > 4 and w.lower() not in common_words
-    ]
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_keywords = []
-    for kw in keywords:
-        if kw not in seen:
-            unique_keywords.append(kw)
-            seen.add(kw)
-    
-    return unique_keywords[min_keywords:max_keywords]
+    # Return a fresh list so callers can't mutate the cached result
+    return list(_extract_keywords_cached(text, min_keywords, max_keywords))
+
+
+def extract_keywords_batch(
+    texts: List[str],
+    min_keywords: int = 3,
+    max_keywords: int = 7,
+) -> List[List[str]]:
+    """
+    Extract keywords for several texts in one call.
+    
+    Identical texts are extracted once and share the result.
+    
+    Args:
+        texts: Input texts
+        min_keywords: Minimum keywords to extract
+        max_keywords: Maximum keywords to extract
+        
+    Returns:
+        One keyword list per input text, in order
+    """
+    unique = {text: _extract_keywords_cached(text, min_keywords, max_keywords) for text in dict.fromkeys(texts)}
+    return [list(unique[text]) for text in texts]
+
+
+# [PAUSE] token with surrounding whitespace, so splitting also trims chunks
+PAUSE_RE = re.compile(r'\s*\[PAUSE\]\s*')
+
+# Words skipped by keyword extraction
+_COMMON_WORDS = frozenset({
+    'the', 'and', 'with', 'from', 'into', 'that', 'this', 'code',
+    'using', 'about', 'will', 'have', 'make', 'your', 'which'
+})
+
+# Keyword candidates: words of 5+ letters (apostrophes allowed after the first)
+_WORD_RE = re.compile(r"[a-z][a-z']{4,}")
+
+
+@lru_cache(maxsize=1024)
+def _extract_keywords_cached(text: str, min_keywords: int, max_keywords: int) -> Tuple[str, ...]:
+    # Simple keyword extraction: words of 5+ letters, excluding common words
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in _COMMON_WORDS]
+    # dict.fromkeys drops duplicates while preserving order
+    return tuple(list(dict.fromkeys(words))[min_keywords:max_keywords])
 
 
 def format_description(
@@ -324,11 +456,15 @@ def format_description(
 # IMAGE UTILITIES
 # ============================================================================
 
+# Upper bound on parallel Pexels image downloads
+PEXELS_DOWNLOAD_WORKERS = 8
+
+
 def fetch_image_from_pexels(
     query: str,
     api_key: str,
     orientation: str = 'portrait',
-) -> Optional[Image.Image]:
+) -> Optional['Image.Image']:
     """
     Fetch image from Pexels API.
     
@@ -340,19 +476,46 @@ def fetch_image_from_pexels(
     Returns:
         PIL Image or None if failed
     """
+    images = fetch_images_from_pexels(query, api_key, count=1, orientation=orientation)
+    return images[0] if images else None
+
+
+def fetch_images_from_pexels(
+    query: str,
+    api_key: str,
+    count: int = 1,
+    orientation: str = 'portrait',
+) -> List['Image.Image']:
+    """
+    Fetch up to `count` images for one query from Pexels.
+    
+    Uses a single search request (per_page=count) and downloads the photos
+    in parallel.
+    
+    Args:
+        query: Search query
+        api_key: Pexels API key
+        count: Number of images wanted (Pexels caps per_page at 80)
+        orientation: 'portrait' or 'landscape'
+        
+    Returns:
+        PIL Images in search result order; empty if failed
+    """
+    Image = _pil_image()
     if Image is None:
         print("⚠️ PIL not available for image processing")
-        return None
+        return []
     
     try:
         headers = {"Authorization": api_key}
         params = {
             "query": query,
-            "per_page": 1,
+            "per_page": max(1, min(count, 80)),
             "orientation": orientation
         }
         
-        response = requests.get(
+        session = get_http_session()
+        response = session.get(
             "https://api.pexels.com/v1/search",
             headers=headers,
             params=params,
@@ -360,26 +523,37 @@ def fetch_image_from_pexels(
         )
         response.raise_for_status()
         
-        data = response.json()
-        if data.get('photos'):
-            image_url = data['photos'][0]['src']['large2x']
-            image_response = requests.get(image_url, timeout=15)
-            image_response.raise_for_status()
-            return Image.open(BytesIO(image_response.content)).convert("RGBA")
+        urls = [photo['src']['large2x'] for photo in response.json().get('photos', [])[:count]]
+        if not urls:
+            return []
+        
+        def _download(url: str) -> Optional[bytes]:
+            # One failed photo shouldn't discard the rest of the batch
+            try:
+                image_response = session.get(url, timeout=15)
+                image_response.raise_for_status()
+                return image_response.content
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ Failed to download Pexels image {url}: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(PEXELS_DOWNLOAD_WORKERS, len(urls))) as pool:
+            contents = list(pool.map(_download, urls))
+        return [Image.open(BytesIO(content)).convert("RGBA") for content in contents if content]
     
     except requests.exceptions.RequestException as e:
         print(f"❌ Network error fetching image from Pexels: {e}")
     except Exception as e:
         print(f"❌ Error fetching image from Pexels: {e}")
     
-    return None
+    return []
 
 
 def create_solid_color_image(
     width: int,
     height: int,
     color: tuple = (12, 17, 29),
-) -> Optional[Image.Image]:
+) -> Optional['Image.Image']:
     """
     Create solid color image.
     
@@ -391,6 +565,7 @@ def create_solid_color_image(
     Returns:
         PIL Image
     """
+    Image = _pil_image()
     if Image is None:
         return None
     
@@ -16,10 +16,15 @@ HTTP behavior simple and expects the project maintainer to verify the correct
 endpoint and response parsing. The default Groq model name used here is
 `gpt-oss-120b` (can be changed via `GROQ_MODEL` env var).
 """
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional
 import os
 import json
+import asyncio
+import atexit
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class LLMResponse:
@@ -28,9 +33,142 @@ class LLMResponse:
         self.raw = raw
 
 
-def generate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
+# Process-wide clients, reused across calls so TLS/DNS setup is paid once
+_client_lock = threading.Lock()
+_http_session: Optional[requests.Session] = None
+_groq_clients: Dict[Optional[str], Any] = {}
+_gemini_models: Dict[Any, Any] = {}
+_gemini_configured_key: Optional[str] = None
+
+
+def _get_http_session() -> requests.Session:
+    """Pooled HTTP session for raw API calls.
+
+    Only failed connections are retried (like httpx's HTTPTransport(retries=2)):
+    a completion POST that reached the provider may already be billed, so it
+    is never resent after a read error or an error status.
+    """
+    global _http_session
+    if _http_session is None:
+        with _client_lock:
+            if _http_session is None:
+                retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _http_session = session
+    return _http_session
+
+
+def _get_groq_client(api_key: Optional[str]):
+    """Return a cached Groq SDK client for `api_key`."""
+    client = _groq_clients.get(api_key)
+    if client is not None:
+        return client
+    from groq import Groq  # type: ignore
+    with _client_lock:
+        client = _groq_clients.get(api_key)
+        if client is None:
+            try:
+                # Create client - sdk may accept api_key param or pick from env
+                client = Groq(api_key=api_key) if api_key else Groq()
+            except TypeError:
+                # Some SDK versions expect no args
+                client = Groq()
+            _groq_clients[api_key] = client
+    return client
+
+
+def _get_gemini_model(genai, api_key: str, model_name: str, system_instruction: Optional[str] = None):
+    """Return a cached GenerativeModel, configuring the SDK only when the key changes.
+
+    Models are keyed by (model name, system instruction) so a static prompt
+    prefix is bound once and sent identically on every call.
+    """
+    global _gemini_configured_key
+    with _client_lock:
+        if _gemini_configured_key != api_key:
+            genai.configure(api_key=api_key)
+            _gemini_configured_key = api_key
+            _gemini_models.clear()
+        key = (model_name, system_instruction)
+        model_obj = _gemini_models.get(key)
+        if model_obj is None:
+            if system_instruction:
+                model_obj = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+            else:
+                model_obj = genai.GenerativeModel(model_name)
+            _gemini_models[key] = model_obj
+    return model_obj
+
+
+def warm_up(cache_prefix: Optional[str] = None) -> None:
+    """Build the configured provider's client ahead of a batch of calls.
+
+    Clients and the pooled HTTP session are process-wide, so later
+    `generate` calls (from any thread) reuse them instead of racing to
+    construct them on the first request. Failures are ignored; `generate`
+    reports configuration problems itself. Pass the same `cache_prefix` the
+    calls will use so the matching Gemini model is the one prepared.
+    """
+    from scripts.config import get_config
+
+    config = get_config()
+    try:
+        _get_http_session()
+        if config.llm_provider == 'groq':
+            _get_groq_client(config.groq_api_key or os.getenv('GROQ_API_KEY'))
+        elif config.gemini_api_key:
+            import google.generativeai as genai  # type: ignore
+            _get_gemini_model(genai, config.gemini_api_key, config.gemini_model, cache_prefix)
+    except Exception:
+        pass
+
+
+@atexit.register
+def _close_clients() -> None:
+    """Close pooled connections at interpreter exit."""
+    global _http_session
+    with _client_lock:
+        session, _http_session = _http_session, None
+        clients = list(_groq_clients.values())
+        _groq_clients.clear()
+    if session is not None:
+        session.close()
+    for client in clients:
+        close = getattr(client, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+def generate(
+    prompt: str,
+    model: Optional[str] = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    cache_prefix: Optional[str] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> LLMResponse:
     """Generate text from the configured LLM provider.
 
+    Pass `stream=True` to use the provider's streaming API; each text piece is
+    handed to `on_chunk` as it arrives so callers can start work before the
+    final token. The full text is still returned once the stream ends.
+
+    `cache_prefix` is static text that precedes `prompt`. It is sent as the
+    system message (Groq) or system instruction (Gemini) so the provider sees
+    the same leading tokens on every call and can serve them from its
+    prefix cache; only `prompt` varies between calls.
+
+    `response_schema` (a JSON-schema dict) requests structured JSON output:
+    Gemini gets `response_mime_type="application/json"` plus the schema,
+    Groq gets JSON mode (`response_format={"type": "json_object"}`), which
+    guarantees well-formed JSON on every Groq chat model.
+
     Returns an LLMResponse with `.text` containing the model output.
     """
     # Deferred import to avoid heavy deps when not used
@@ -50,24 +188,28 @@ def generate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
         # completion = client.chat.completions.create(...)
         api_key = config.groq_api_key or os.getenv('GROQ_API_KEY')
         try:
-            from groq import Groq  # type: ignore
-            try:
-                # Create client - sdk may accept api_key param or pick from env
-                client = Groq(api_key) if api_key else Groq()
-            except TypeError:
-                # Some SDK versions expect no args
-                client = Groq()
+            client = _get_groq_client(api_key)
+
+            messages = [{"role": "user", "content": prompt}]
+            if cache_prefix:
+                messages.insert(0, {"role": "system", "content": cache_prefix})
 
             # Build completion parameters using kwargs defaults where appropriate
+            extra = {}
+            # Groq's JSON mode doesn't support streaming; a streamed call
+            # keeps streaming and relies on the prompt for the JSON shape
+            if response_schema and not kwargs.get('stream'):
+                extra['response_format'] = {"type": "json_object"}
             completion = client.chat.completions.create(
                 model=model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 temperature=kwargs.get('temperature', 1),
                 max_completion_tokens=kwargs.get('max_completion_tokens', 4096),
                 top_p=kwargs.get('top_p', 1),
                 reasoning_effort=kwargs.get('reasoning_effort', 'medium'),
                 stream=kwargs.get('stream', False),
                 stop=kwargs.get('stop', None),
+                **extra,
             )
 
             # First try to extract text via common attributes without iterating.
@@ -110,6 +252,8 @@ def generate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
                             pass
                     if part:
                         pieces.append(part)
+                        if on_chunk is not None:
+                            on_chunk(part)
                     else:
                         # Avoid appending raw reprs; skip if nothing useful
                         continue
@@ -141,9 +285,9 @@ def generate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
             }
             payload = {
                 'model': model,
-                'input': prompt,
+                'input': (cache_prefix or '') + prompt,
             }
-            resp = requests.post(api_url, headers=headers, json=payload, timeout=30)
+            resp = _get_http_session().post(api_url, headers=headers, json=payload, timeout=30)
             try:
                 resp.raise_for_status()
             except Exception as e:
@@ -161,10 +305,26 @@ def generate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
         if not api_key:
             raise RuntimeError("Gemini provider selected but `GEMINI_API_KEY` / `GOOGLE_API_KEY` not set.")
 
-        genai.configure(api_key=api_key)
         model_name = model or config.gemini_model
-        model_obj = genai.GenerativeModel(model_name)
-        out = model_obj.generate_content(prompt)
+        model_obj = _get_gemini_model(genai, api_key, model_name, cache_prefix)
+        call_kwargs = {}
+        if response_schema:
+            call_kwargs['generation_config'] = {
+                'response_mime_type': 'application/json',
+                'response_schema': response_schema,
+            }
+        if kwargs.get('stream'):
+            out = model_obj.generate_content(prompt, stream=True, **call_kwargs)
+            pieces = []
+            for chunk in out:
+                part = getattr(chunk, 'text', None)
+                if part:
+                    pieces.append(part)
+                    if on_chunk is not None:
+                        on_chunk(part)
+            return LLMResponse(text=''.join(pieces), raw=out)
+
+        out = model_obj.generate_content(prompt, **call_kwargs)
         # genai response objects commonly expose `.text` - normalize for compatibility
         text = getattr(out, 'text', None)
         if text is None:
@@ -174,3 +334,12 @@ def generate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
             except Exception:
                 text = str(out)
         return LLMResponse(text=str(text), raw=out)
+
+
+async def agenerate(prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
+    """Async variant of `generate`.
+
+    Neither provider SDK used here is non-blocking, so the call runs in a worker
+    thread; the shared clients/session above are reused across threads.
+    """
+    return await asyncio.to_thread(generate, prompt, model, **kwargs)
@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import List
 import logging
 
+from scripts.utils import PAUSE_RE
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,8 +35,7 @@ def _get_ffmpeg_exe():
 def _split_for_tts(text: str):
     if not text:
         return []
-    parts = [p.strip() for p in text.split('[PAUSE]')]
-    return [p for p in parts if p]
+    return [p for p in PAUSE_RE.split(text.strip()) if p]
 
 
 def _concatenate_audio(audio_paths: List[str], output_path: str) -> str:
@@ -147,13 +148,13 @@ if _provider in ('gtts', '', None):
         finally:
             for f in temp_files:
                 try:
-                    Path(f).unlink()
-                except Exception:
+                    Path(f).unlink(missing_ok=True)
+                except OSError:
                     pass
             if silence_tmp:
                 try:
-                    Path(silence_tmp.name).unlink()
-                except Exception:
+                    Path(silence_tmp.name).unlink(missing_ok=True)
+                except OSError:
                     pass
 
 
@@ -220,13 +221,13 @@ elif _provider in ('edge', 'edge-tts'):
         finally:
             for f in temp_files:
                 try:
-                    Path(f).unlink()
-                except Exception:
+                    Path(f).unlink(missing_ok=True)
+                except OSError:
                     pass
             if silence_tmp:
                 try:
-                    Path(silence_tmp.name).unlink()
-                except Exception:
+                    Path(silence_tmp.name).unlink(missing_ok=True)
+                except OSError:
                     pass
 
 
@@ -287,11 +288,11 @@ else:
         finally:
             for f in temp_files:
                 try:
-                    Path(f).unlink()
-                except Exception:
+                    Path(f).unlink(missing_ok=True)
+                except OSError:
                     pass
             if silence_tmp:
                 try:
-                    Path(silence_tmp.name).unlink()
-                except Exception:
+                    Path(silence_tmp.name).unlink(missing_ok=True)
+                except OSError:
                     pass
@@ -10,6 +10,8 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from pathlib import Path
 
+from scripts.utils import PAUSE_RE
+
 # Define the paths for the credential files in the root directory
 CLIENT_SECRETS_FILE = Path('client_secrets.json')
 CREDENTIALS_FILE = Path('credentials.json')
@@ -215,7 +217,7 @@ def generate_metadata_from_script(script_data: dict, topic: str = None):
     hashtags_str = ' '.join(hashtags[:20])
     
     # Build description
-    parts = [p.strip() for p in script.split('[PAUSE]') if p.strip()]
+    parts = [p for p in PAUSE_RE.split(script.strip()) if p]
     summary = ''
     if len(parts) > 1:
         summary = parts[1].strip()
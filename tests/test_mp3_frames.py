@@ -0,0 +1,30 @@
+"""
+test_mp3_frames.py - Test MP3 frame location used for [PAUSE] stitching
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.tts_generator import _mp3_audio_span
+
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono: 96-byte frames (gTTS output format)
+FRAME = bytes([0xFF, 0xF3, 0x44, 0xC4]) + b'\x00' * 92
+
+
+def test_mp3_audio_span_skips_tags_and_vbr_header():
+    """Test that ID3 tags and the Xing frame are excluded from the span."""
+    id3v2 = b'ID3\x03\x00\x00\x00\x00\x00\x05' + b'\x00' * 5
+    xing = FRAME[:13] + b'Xing' + FRAME[17:]
+    id3v1 = b'TAG' + b'\x00' * 125
+    data = id3v2 + xing + FRAME * 3 + id3v1
+
+    start, end, params = _mp3_audio_span(data)
+    assert params == (24000, 1)
+    assert data[start:end] == FRAME * 3
+
+    assert _mp3_audio_span(FRAME * 2) == (0, len(FRAME) * 2, (24000, 1))
+    assert _mp3_audio_span(b'RIFF\x00\x00\x00\x00WAVE') is None
@@ -0,0 +1,135 @@
+"""
+test_script_cache.py - Test the semantic script cache
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.script_cache import SemanticScriptCache, GenerativeScriptCache
+
+
+IDEA = {
+    'title': 'Python List Trick That Saves Hours',
+    'hook': 'Did you know this Python trick?',
+    'body': 'Use list comprehension instead of loops.',
+}
+SCRIPT = {'script': 'Use list comprehensions. [PAUSE] They are faster.', 'duration_seconds': 30}
+
+
+def test_semantic_cache_hit_and_topic_guard():
+    """Test that identical ideas hit, other topics miss, and entries persist."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticScriptCache(Path(tmp), threshold=0.92)
+        assert cache.lookup(IDEA, 'Python') is None
+
+        cache.store(IDEA, 'Python', SCRIPT)
+        hit = cache.lookup(dict(IDEA), 'Python')
+        assert hit == SCRIPT
+        assert hit is not SCRIPT, "Cache should return a copy"
+
+        # Same idea under a different topic must never reuse the script
+        assert cache.lookup(IDEA, 'JavaScript') is None
+
+        # Unrelated idea misses
+        other = {'title': 'Git rebase explained', 'hook': 'Stop merging', 'body': 'Rebase keeps history linear.'}
+        assert cache.lookup(other, 'Python') is None
+
+        # A fresh instance reads the persisted entries
+        reloaded = SemanticScriptCache(Path(tmp), threshold=0.92)
+        assert reloaded.lookup(IDEA, 'Python') == SCRIPT
+    print("✅ Semantic cache hit/miss behaviour correct")
+
+
+def test_semantic_cache_substitutes_cta():
+    """Test that a near-duplicate idea gets its own CTA in the cached script."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticScriptCache(Path(tmp), threshold=0.9)
+        cache.store({**IDEA, 'cta': 'Follow for more!'}, 'Python',
+                    {'script': 'Use list comprehensions. [PAUSE] Follow for more!'})
+        reworded = {**IDEA, 'title': 'Python List Trick That Saves Hours!', 'cta': 'Subscribe now!'}
+        hit = cache.lookup(reworded, 'Python')
+        assert hit['script'] == 'Use list comprehensions. [PAUSE] Subscribe now!'
+    print("✅ Semantic cache substitutes idea fields")
+
+
+def test_generative_cache_fills_template_slots():
+    """Test that a slot-dominated response is re-filled for a new idea."""
+    idea = {'title': 'Swap variables', 'hook': 'Swap two variables in one line.',
+            'body': 'Python lets you write a, b = b, a without a temp variable.',
+            'cta': 'Follow for more Python tips!', 'difficulty': 'beginner'}
+    script = {
+        'script': f"{idea['hook']} [PAUSE] {idea['body']} [PAUSE] {idea['cta']}",
+        'visual_cues': [{'time_seconds': 0, 'duration_seconds': 3, 'type': 'text', 'content': idea['title']}],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = GenerativeScriptCache(Path(tmp))
+        assert cache.store(idea, 'Python', 30, script) is True
+
+        new_idea = {'title': 'Reverse a list', 'hook': 'Reverse any list instantly.',
+                    'body': 'Slice it with [::-1] and you are done.',
+                    'cta': 'Save this for later!', 'difficulty': 'beginner'}
+        filled = cache.lookup(new_idea, 'Python', 30)
+        assert filled['script'] == f"{new_idea['hook']} [PAUSE] {new_idea['body']} [PAUSE] {new_idea['cta']}"
+        assert filled['visual_cues'][0]['content'] == 'Reverse a list'
+        assert filled['keywords']
+
+        # Different structure (duration) misses
+        assert cache.lookup(new_idea, 'Python', 45) is None
+
+        # Free-form responses are not stored as templates
+        assert cache.store(idea, 'Python', 60, {'script': 'Something entirely different and generic here.'}) is False
+    print("✅ Generative cache fills template slots")
+
+
+def test_semantic_cache_drops_oldest_beyond_cap():
+    """Test that the cache keeps at most max_entries and leaves no temp files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticScriptCache(Path(tmp), threshold=0.99, max_entries=2)
+        ideas = [{'title': f'Idea number {i}', 'hook': f'Hook {i}', 'body': f'Body text {i}'} for i in range(3)]
+        for i, idea in enumerate(ideas):
+            cache.store(idea, 'Python', {'script': f'Script {i}'})
+
+        reloaded = SemanticScriptCache(Path(tmp), threshold=0.99, max_entries=2)
+        assert reloaded.lookup(ideas[0], 'Python') is None
+        assert reloaded.lookup(ideas[2], 'Python') == {'script': 'Script 2'}
+        assert [p.name for p in Path(tmp).iterdir()] == ['semantic_script_cache.sqlite3']
+    print("✅ Semantic cache capped at max_entries")
+
+
+def test_caches_keep_entries_from_concurrent_writers():
+    """Test that two writers sharing a cache directory don't drop each other's entries."""
+    other = {'title': 'Git rebase explained', 'hook': 'Stop merging', 'body': 'Rebase keeps history linear.'}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Separate instances stand in for worker processes; both read first
+        first = SemanticScriptCache(Path(tmp), threshold=0.92)
+        second = SemanticScriptCache(Path(tmp), threshold=0.92)
+        assert first.lookup(IDEA, 'Python') is None
+        assert second.lookup(other, 'Git') is None
+
+        first.store(IDEA, 'Python', SCRIPT)
+        second.store(other, 'Git', {'script': 'Rebase it.'})
+        assert first.lookup(other, 'Git') == {'script': 'Rebase it.'}
+        assert second.lookup(IDEA, 'Python') == SCRIPT
+
+        templates_a, templates_b = GenerativeScriptCache(Path(tmp)), GenerativeScriptCache(Path(tmp))
+        idea = {'title': 'Swap variables', 'hook': 'Swap two variables in one line.',
+                'body': 'Python lets you write a, b = b, a without a temp variable.',
+                'cta': 'Follow for more Python tips!'}
+        script = {'script': f"{idea['hook']} [PAUSE] {idea['body']} [PAUSE] {idea['cta']}"}
+        assert templates_a.store(idea, 'Python', 30, script)
+        assert templates_b.store(idea, 'Python', 45, script)
+        assert templates_a.lookup(idea, 'Python', 45) is not None
+        assert templates_b.lookup(idea, 'Python', 30) is not None
+    print("✅ Script caches keep entries from concurrent writers")
+
+
+if __name__ == '__main__':
+    test_semantic_cache_hit_and_topic_guard()
+    test_semantic_cache_substitutes_cta()
+    test_generative_cache_fills_template_slots()
+    test_semantic_cache_drops_oldest_beyond_cap()
+    test_caches_keep_entries_from_concurrent_writers()
@@ -4,12 +4,45 @@ test_startup_verifier.py - Test startup verification functionality
 
 import os
 import sys
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from unittest import mock
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scripts.startup_verifier import should_run_startup_verification, run_startup_verification_if_enabled
+from scripts import startup_verifier
+from scripts.startup_verifier import (
+    FLAG_TERMINATOR,
+    refresh_config,
+    run_startup_verification_if_enabled,
+    should_run_startup_verification,
+)
+
+
+def _clear_marker_paths():
+    for resolver in (startup_verifier._inprogress_file, startup_verifier._auth_ok_file,
+                     startup_verifier._thumb_cache_file, startup_verifier._failed_file,
+                     startup_verifier._marker_str):
+        resolver.cache_clear()
+
+
+@contextmanager
+def _run_once_markers_in(tmp: str, **env):
+    """Enable run-once verification with all markers under `tmp`."""
+    env = {'STARTUP_VERIFICATION': 'true', 'STARTUP_VERIFICATION_RUN_ONCE': 'true', **env}
+    flag = Path(tmp) / '.startup_verification_complete'
+    with mock.patch.dict(os.environ, env), \
+            mock.patch.object(startup_verifier, '_flag_file', return_value=flag):
+        _clear_marker_paths()
+        refresh_config()
+        try:
+            yield flag
+        finally:
+            _clear_marker_paths()
+    refresh_config()
 
 
 def test_verification_disabled():
@@ -73,6 +106,82 @@ def test_conditional_run():
         del os.environ['STARTUP_VERIFICATION']
 
 
+def test_malformed_full_setting_does_not_break_lightweight():
+    """Test that a bad value for a full-upload setting falls back to its default."""
+    os.environ['STARTUP_VERIFICATION'] = 'true'
+    os.environ['STARTUP_VERIFICATION_FULL_TIMEOUT_SEC'] = '10m'
+    try:
+        cfg = refresh_config()
+        assert cfg.full_timeout == 600
+        assert should_run_startup_verification() is True
+        print("✅ Malformed STARTUP_VERIFICATION_FULL_TIMEOUT_SEC falls back to default")
+    finally:
+        del os.environ['STARTUP_VERIFICATION']
+        del os.environ['STARTUP_VERIFICATION_FULL_TIMEOUT_SEC']
+        refresh_config()
+
+
+def test_failure_cooldown_doubles():
+    """Test that each consecutive failure doubles the cooldown, up to 24h."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            _run_once_markers_in(tmp, STARTUP_VERIFICATION_FAILURE_COOLDOWN_HOURS='1'):
+        for count, hours in ((1, 1), (2, 2), (3, 4)):
+            startup_verifier._write_failed_marker('probe failed')
+            retry_after, seen = startup_verifier._read_failed_marker()
+            assert seen == count
+            assert abs((retry_after - time.time()) - hours * 3600) < 5
+            refresh_config()
+            assert should_run_startup_verification() is False
+
+        # A transient failure keeps the count, so the cooldown does not grow
+        startup_verifier._write_failed_marker('probe timed out', transient=True)
+        retry_after, seen = startup_verifier._read_failed_marker()
+        assert seen == 3
+        assert abs((retry_after - time.time()) - 4 * 3600) < 5
+
+        for _ in range(10):
+            startup_verifier._write_failed_marker('probe failed')
+        retry_after, _ = startup_verifier._read_failed_marker()
+        assert abs((retry_after - time.time()) - startup_verifier.FAILURE_COOLDOWN_CAP_SECONDS) < 5
+
+        # Once the cooldown has passed, verification runs again
+        startup_verifier._failed_file().write_text(f"{int(time.time()) - 1}\n13\nprobe failed\n")
+        refresh_config()
+        assert should_run_startup_verification() is True
+    print("✅ Failure cooldown doubles and is capped at 24h")
+
+
+def test_truncated_flag_is_rejected():
+    """Test that a completion flag without the READY terminator doesn't count."""
+    with tempfile.TemporaryDirectory() as tmp, _run_once_markers_in(tmp) as flag:
+        flag.write_text("Verification completed at 2026-01-01T00:00:00\n")
+        assert startup_verifier._is_flag_valid(str(flag)) is False
+        assert not flag.exists(), "A torn flag should be removed"
+        assert should_run_startup_verification() is True
+
+        startup_verifier._atomic_write_flag(flag, "Verification completed at 2026-01-01T00:00:00\n")
+        assert flag.read_text().endswith(FLAG_TERMINATOR)
+        refresh_config()
+        assert should_run_startup_verification() is False
+    print("✅ Flag without READY terminator rejected")
+
+
+def test_decision_cache_invalidated_after_run():
+    """Test that a finished verification is seen without waiting for the decision TTL."""
+    def passing_checks(t0):
+        startup_verifier._promote_inprogress_to_flag("Verification completed\nLightweight verification passed\n")
+        return {'status': 'verified'}
+
+    with tempfile.TemporaryDirectory() as tmp, _run_once_markers_in(tmp) as flag:
+        assert should_run_startup_verification() is True
+        with mock.patch.object(startup_verifier, '_run_startup_checks', side_effect=passing_checks):
+            assert startup_verifier.generate_startup_short()['status'] == 'verified'
+        assert flag.exists()
+        # Same settings and TTL window as the cached True above
+        assert should_run_startup_verification() is False
+    print("✅ Decision cache invalidated after a run")
+
+
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("STARTUP VERIFIER CONFIGURATION TEST")
@@ -84,6 +193,14 @@ if __name__ == '__main__':
         test_verification_can_be_enabled()
         print()
         test_conditional_run()
+        print()
+        test_malformed_full_setting_does_not_break_lightweight()
+        print()
+        test_failure_cooldown_doubles()
+        print()
+        test_truncated_flag_is_rejected()
+        print()
+        test_decision_cache_invalidated_after_run()
         
         print("\n" + "="*70)
         print("✅ ALL STARTUP VERIFIER TESTS PASSED")
@@ -0,0 +1,90 @@
+"""
+test_tts_cache.py - Test the on-disk TTS audio cache
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from unittest import mock
+
+import requests
+
+from scripts.tts_cache import TTSCache, tts_cache_key
+from scripts.tts_generator import TTSGenerator
+
+
+def test_tts_cache_round_trip_and_key():
+    """Test that stored audio is served back and keys separate voices."""
+    key = tts_cache_key('Hello there', 'gtts', 'en', 'normal')
+    assert key == tts_cache_key('Hello there', 'GTTS', 'en', 'normal')
+    assert key != tts_cache_key('Hello there', 'gtts', 'en', 'fast')
+    assert key != tts_cache_key('Hello there', 'ttsmaker', 'en', 'normal')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        cache = TTSCache(tmp / 'tts')
+        assert cache.fetch(key, tmp / 'miss.mp3') is None
+
+        src = tmp / 'src.mp3'
+        src.write_bytes(b'ID3 fake audio')
+        cache.store(key, src)
+        hit = cache.fetch(key, tmp / 'out' / 'hit.mp3')
+        assert hit == tmp / 'out' / 'hit.mp3'
+        assert hit.read_bytes() == b'ID3 fake audio'
+        assert not list((tmp / 'tts').glob('*.tmp')), "Temp files must not be left behind"
+    print("✅ TTS cache round trip correct")
+
+
+def test_tts_cache_evicts_least_recently_used():
+    """Test that the oldest entries go first once the size cap is exceeded."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        cache = TTSCache(tmp / 'tts', max_bytes=250)
+        src = tmp / 'src.mp3'
+        src.write_bytes(b'x' * 100)
+        for i, key in enumerate(('a', 'b')):
+            cache.store(key, src)
+            os.utime(tmp / 'tts' / f'{key}.mp3', (1000 + i, 1000 + i))
+
+        cache.store('c', src)
+        remaining = sorted(p.stem for p in (tmp / 'tts').glob('*.mp3'))
+        assert remaining == ['b', 'c'], remaining
+    print("✅ TTS cache LRU eviction correct")
+
+
+def test_ttsmaker_fallback_not_cached_under_ttsmaker_key():
+    """Test that gTTS audio from a TTSMaker outage is cached as gTTS, not TTSMaker."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        generator = TTSGenerator()
+        generator.cache = TTSCache(tmp / 'tts')
+        text = 'Fallback voice check'
+
+        def fake_gtts(text, output_path):
+            output_path.write_bytes(b'gtts audio')
+            return output_path
+
+        session = mock.Mock()
+        session.post.side_effect = requests.exceptions.ConnectionError('down')
+        with mock.patch.dict(os.environ, {'TTSMAKER_API_KEY': 'key'}), \
+                mock.patch('scripts.tts_generator.get_http_session', return_value=session), \
+                mock.patch.object(generator, '_generate_with_gtts', side_effect=fake_gtts):
+            out = generator.generate_speech(text, tmp / 'out.mp3', provider='ttsmaker')
+
+        assert out is not None and out.read_bytes() == b'gtts audio'
+        ttsmaker_key = tts_cache_key(text, 'ttsmaker', generator.language, generator.speed)
+        gtts_key = tts_cache_key(text, 'gtts', generator.language, generator.speed)
+        assert not (tmp / 'tts' / f'{ttsmaker_key}.mp3').exists()
+        assert (tmp / 'tts' / f'{gtts_key}.mp3').exists()
+    print("✅ TTSMaker fallback cached under the gTTS key")
+
+
+if __name__ == '__main__':
+    test_tts_cache_round_trip_and_key()
+    test_tts_cache_evicts_least_recently_used()
+    test_ttsmaker_fallback_not_cached_under_ttsmaker_key()
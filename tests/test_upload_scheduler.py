@@ -0,0 +1,70 @@
+"""
+test_upload_scheduler.py - Test the upload scheduler's run lock
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import upload_scheduler
+
+
+def _patched_lock_path(tmp: str):
+    return mock.patch.object(upload_scheduler, '_get_lock_path', return_value=Path(tmp) / 'upload_scheduler.lock')
+
+
+def test_lock_held_blocks_second_acquire():
+    """Test that a second acquire while the lock is held yields False."""
+    with tempfile.TemporaryDirectory() as tmp, _patched_lock_path(tmp):
+        with upload_scheduler._acquire_lock() as first:
+            assert first is True
+            with upload_scheduler._acquire_lock() as second:
+                assert second is False
+    print("✅ Held lock blocks a second run")
+
+
+def test_stale_lock_file_is_reclaimed():
+    """Test that a lock file left by a dead run is taken over."""
+    with tempfile.TemporaryDirectory() as tmp, _patched_lock_path(tmp):
+        lock = upload_scheduler._get_lock_path()
+        lock.write_text("pid:1\nstart:2000-01-01T00:00:00+00:00\n")
+        # Old enough for the age-based check used where fcntl is missing
+        old = time.time() - 5 * 3600
+        os.utime(lock, (old, old))
+
+        with upload_scheduler._acquire_lock() as held:
+            assert held is True
+            assert lock.read_text().startswith(f"pid:{os.getpid()}\n")
+    print("✅ Stale lock file reclaimed")
+
+
+def test_lock_file_removed_on_exit():
+    """Test that the lock file is removed after the run, even if it raises."""
+    with tempfile.TemporaryDirectory() as tmp, _patched_lock_path(tmp):
+        lock = upload_scheduler._get_lock_path()
+        with upload_scheduler._acquire_lock() as held:
+            assert held and lock.exists()
+        assert not lock.exists()
+
+        try:
+            with upload_scheduler._acquire_lock():
+                raise RuntimeError('run failed')
+        except RuntimeError:
+            pass
+        assert not lock.exists()
+
+        with upload_scheduler._acquire_lock() as again:
+            assert again is True
+    print("✅ Lock file removed on exit")
+
+
+if __name__ == '__main__':
+    test_lock_held_blocks_second_acquire()
+    test_stale_lock_file_is_reclaimed()
+    test_lock_file_removed_on_exit()